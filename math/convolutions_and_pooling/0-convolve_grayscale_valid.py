@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """performs a valid convolution on grayscale images"""
 import numpy as np
+convolve_im2col = __import__('im2col').convolve_im2col
 
 
 def convolve_grayscale_valid(images, kernel):
@@ -16,20 +17,6 @@ def convolve_grayscale_valid(images, kernel):
         kw: the width of the kernel
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
-    h = images.shape[1]
-    w = images.shape[2]
-    kh = kernel.shape[0]
-    kw = kernel.shape[1]
-
-    convolvedW = w - kw + 1
-    convolvedH = h - kh + 1
-    convolvedMatrix = np.zeros((m, convolvedH, convolvedW))
-
-    for x in range(convolvedW):
-        for y in range(convolvedH):
-            shredder = images[:, y:y + kh, x:x + kw]
-            convolvedMatrix[:, y, x] = np.tensordot(shredder,
-                                                    kernel,
-                                                    axes=2)
-    return convolvedMatrix
+    convolvedMatrix = convolve_im2col(images[..., np.newaxis],
+                                      kernel[..., np.newaxis, np.newaxis])
+    return convolvedMatrix[..., 0]
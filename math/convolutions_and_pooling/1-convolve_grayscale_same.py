@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """performs a same convolution on grayscale images"""
 import numpy as np
+convolve_im2col = __import__('im2col').convolve_im2col
 
 
 def convolve_grayscale_same(images, kernel):
@@ -17,7 +18,6 @@ def convolve_grayscale_same(images, kernel):
     if necessary, the image should be padded with 0’s
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
     h = images.shape[1]
     w = images.shape[2]
     kh = kernel.shape[0]
@@ -27,17 +27,8 @@ def convolve_grayscale_same(images, kernel):
     padH = kh // 2
     padW = kw // 2
 
-    # pad dem images
-    padded_images = np.pad(
-        images, ((0, 0), (padH, padH), (padW, padW))
-        )
-
-    convolvedMatrix = np.zeros((m, h, w))
-    for x in range(w):
-        for y in range(h):
-            shredder = padded_images[:, y:y + kh, x:x + kw]
-            if shredder.shape[1:] == kernel.shape:
-                convolvedMatrix[:, y, x] = np.tensordot(shredder,
-                                                        kernel,
-                                                        axes=2)
-    return convolvedMatrix
+    convolvedMatrix = convolve_im2col(images[..., np.newaxis],
+                                      kernel[..., np.newaxis, np.newaxis],
+                                      padding=(padH, padW))
+    # even kernels overshoot by one row/column, keep the first h x w
+    return convolvedMatrix[:, :h, :w, 0]
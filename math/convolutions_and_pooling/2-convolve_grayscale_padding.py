@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """performs a convolution on grayscale images with custom padding"""
 import numpy as np
+convolve_im2col = __import__('im2col').convolve_im2col
 
 
 def convolve_grayscale_padding(images, kernel, padding):
@@ -21,22 +22,7 @@ def convolve_grayscale_padding(images, kernel, padding):
         the image should be padded with 0’s
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
-    h = images.shape[1]
-    w = images.shape[2]
-    kh = kernel.shape[0]
-    kw = kernel.shape[1]
-    ph, pw = padding
-
-    # padd images with zeros
-    padded_images = np.pad(images, ((0, 0), (ph, ph), (pw, pw)), 'constant')
-
-    convolvedW = w - kw + 1 + (2 * pw)
-    convolvedH = h - kh + 1 + (2 * ph)
-    convolvedMatrix = np.zeros((m, convolvedH, convolvedW))
-
-    for x in range(convolvedW):
-        for z in range(convolvedH):
-            shredder = padded_images[:, z:z + kh, x:x + kw]
-            convolvedMatrix[:, z, x] = np.tensordot(shredder, kernel, axes=2)
-    return convolvedMatrix
+    convolvedMatrix = convolve_im2col(images[..., np.newaxis],
+                                      kernel[..., np.newaxis, np.newaxis],
+                                      padding=padding)
+    return convolvedMatrix[..., 0]
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """performs a convolution on grayscale images"""
 import numpy as np
+convolve_method = __import__('fft_convolve').convolve_method
 
 
-def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
+def convolve_grayscale(images, kernel, padding='same', stride=(1, 1),
+                       method='direct'):
     """
     images is a numpy.ndarray with shape (m, h, w)
         containing multiple grayscale images
@@ -25,9 +27,16 @@ def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
     stride is a tuple of (sh, sw)
         sh: the stride for the height of the image
         sw: the stride for the width of the image
+    method is either 'direct' (the default), 'fft' or 'auto'
+        'direct' runs the im2col matrix multiplication
+        'fft' multiplies the images and kernels in the frequency domain,
+            which is cheaper for large kernels
+        'auto' picks whichever is estimated to be cheaper
+        'fft' and 'auto' are opt-in: fft results differ from direct ones
+            by floating point error (about 1e-12), except on integer
+            images and kernels, which are rounded back to exact values
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
     h = images.shape[1]
     w = images.shape[2]
     kh = kernel.shape[0]
@@ -43,13 +52,8 @@ def convolve_grayscale(images, kernel, padding='same', stride=(1, 1)):
     elif type(padding) == tuple:
         ph, pw = padding
 
-    convolvedW = (w - kw + (2 * pw)) // sw + 1
-    convolvedH = (h - kh + (2 * ph)) // sh + 1
-    padded_images = np.pad(images, ((0, 0), (ph, ph), (pw, pw)), 'constant')
-    convolvedMatrix = np.zeros((m, convolvedH, convolvedW))
-
-    for i in range(convolvedW):
-        for j in range(convolvedH):
-            shredder = padded_images[:, sh*j:sh*j + kh, sw*i:sw*i + kw]
-            convolvedMatrix[:, j, i] = np.tensordot(shredder, kernel, axes=2)
-    return convolvedMatrix
+    convolvedMatrix = convolve_method(images[..., np.newaxis],
+                                      kernel[..., np.newaxis, np.newaxis],
+                                      padding=(ph, pw), stride=stride,
+                                      method=method)
+    return convolvedMatrix[..., 0]
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """performs a convolution on images with channels"""
 import numpy as np
+convolve_im2col = __import__('im2col').convolve_im2col
 
 
 def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
@@ -29,13 +30,10 @@ def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
         sw: the stride for the width of the image
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
     h = images.shape[1]
     w = images.shape[2]
-    c = images.shape[3]
     kh = kernel.shape[0]
     kw = kernel.shape[1]
-    c = kernel.shape[2]
     sh, sw = stride
 
     if padding == 'same':
@@ -47,17 +45,6 @@ def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
     elif type(padding) == tuple:
         ph, pw = padding
 
-    convolvedW = ((w + (2 * pw) - kw) // sw) + 1
-    convolvedH = ((h + (2 * ph) - kh) // sh) + 1
-    padded_images = np.pad(images, ((0, 0),
-                                    (ph, ph),
-                                    (pw, pw),
-                                    (0, 0)),
-                           'constant')
-    convolvedMatrix = np.zeros((m, convolvedH, convolvedW))
-
-    for i in range(convolvedW):
-        for j in range(convolvedH):
-            shredder = padded_images[:, sh*j:sh*j + kh, sw*i:sw*i + kw, :]
-            convolvedMatrix[:, j, i] = np.tensordot(shredder, kernel, axes=3)
-    return convolvedMatrix
+    convolvedMatrix = convolve_im2col(images, kernel[..., np.newaxis],
+                                      padding=(ph, pw), stride=stride)
+    return convolvedMatrix[..., 0]
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """performs a convolution on images using multiple kernels"""
 import numpy as np
+convolve_method = __import__('fft_convolve').convolve_method
+convolve_tiled = __import__('tiled_convolve').convolve_tiled
 
 
-def convolve(images, kernels, padding='same', stride=(1, 1)):
+def convolve(images, kernels, padding='same', stride=(1, 1),
+             method='direct', out=None, batch_size=None, tile_rows=None):
     """
 
     images is a numpy.ndarray with shape (m, h, w, c)
@@ -28,16 +31,26 @@ def convolve(images, kernels, padding='same', stride=(1, 1)):
     stride is a tuple of (sh, sw)
         sh: the stride for the height of the image
         sw: the stride for the width of the image
+    method is either 'direct' (the default), 'fft' or 'auto'
+        'direct' runs the im2col matrix multiplication
+        'fft' multiplies the images and kernels in the frequency domain,
+            which is cheaper for large kernels
+        'auto' picks whichever is estimated to be cheaper
+        'fft' and 'auto' are opt-in: fft results differ from direct ones
+            by floating point error (about 1e-12), except on integer
+            images and kernels, which are rounded back to exact values
+    out, batch_size and tile_rows switch to the streaming mode:
+        out is an optional array (e.g. a np.memmap) the result is written to
+        batch_size is the number of images convolved at a time
+        tile_rows is the number of output rows convolved at a time
+        the padded images are never materialized and peak memory is
+            bounded by the tile size instead of m
     Returns: a numpy.ndarray containing the convolved images
     """
-    m = images.shape[0]
     h = images.shape[1]
     w = images.shape[2]
-    c = images.shape[3]
     kh = kernels.shape[0]
     kw = kernels.shape[1]
-    kc = kernels.shape[2]
-    nc = kernels.shape[3]
     sh, sw = stride
 
     if padding == 'same':
@@ -49,20 +62,9 @@ def convolve(images, kernels, padding='same', stride=(1, 1)):
     elif type(padding) == tuple:
         ph, pw = padding
 
-    convolvedW = ((w - kw + (2 * pw)) // sw) + 1
-    convolvedH = ((h - kh + (2 * ph)) // sh) + 1
-    padded_images = np.pad(images, ((0, 0),
-                                    (ph, ph),
-                                    (pw, pw),
-                                    (0, 0)),
-                           'constant')
-    convolvedMatrix = np.zeros((m, convolvedH, convolvedW, nc))
-
-    for i in range(nc):
-        for w in range(convolvedW):
-            for h in range(convolvedH):
-                shredder = padded_images[:, sh*h:sh*h + kh, sw*w:sw*w + kw]
-                convolvedMatrix[:, h, w, i] = np.tensordot(shredder,
-                                                           kernels[:, :, :, i],
-                                                           axes=3)
-    return convolvedMatrix
+    if out is not None or batch_size is not None or tile_rows is not None:
+        return convolve_tiled(images, kernels, padding=(ph, pw),
+                              stride=stride, method=method, out=out,
+                              batch_size=batch_size, tile_rows=tile_rows)
+    return convolve_method(images, kernels, padding=(ph, pw), stride=stride,
+                           method=method)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+convolve = __import__('5-convolve').convolve
+fft_convolve = __import__('fft_convolve')
+
+
+def best_of(fn, repeat=3):
+    """fastest wall time of repeat calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    # FFT_FLOP_COST fitted on every case: with direct time = beta * direct
+    # cost, the fft time is beta * (FFT_FLOP_COST * flops + multiplications)
+    fits = []
+    for shape, nc in [((16, 64, 64, 1), 1), ((4, 128, 128, 3), 4),
+                      ((1, 520, 520, 1), 1)]:
+        images = np.random.rand(*shape)
+        print("images {}, {} kernel(s), valid padding".format(shape, nc))
+        print("\t{:>7} {:>9} {:>9} {:>7} {:>9}".format(
+            'kernel', 'direct', 'fft', 'auto', 'fit'))
+        for k in [3, 5, 7, 9, 11, 15, 21]:
+            kernels = np.random.randn(k, k, shape[3], nc)
+            direct_t, expected = best_of(
+                lambda: convolve(images, kernels, 'valid', method='direct'))
+            fft_t, result = best_of(
+                lambda: convolve(images, kernels, 'valid', method='fft'))
+            assert np.allclose(result, expected)
+            winner = 'fft' if fft_t < direct_t else 'direct'
+            auto = fft_convolve.choose_method(shape, kernels.shape)
+            direct, flops, multiplications = fft_convolve.method_costs(
+                shape, kernels.shape)
+            fit = (fft_t * direct / direct_t - multiplications) / flops
+            fits.append(fit)
+            print("\t{:>7} {:>8.4f}s {:>8.4f}s {:>7} {:>9.3f}{}".format(
+                '{0}x{0}'.format(k), direct_t, fft_t, auto, fit,
+                '' if auto == winner else ' (measured: {})'.format(winner)))
+    print("FFT_FLOP_COST is {}, the median fit here is {:.3f}".format(
+        fft_convolve.FFT_FLOP_COST, np.median(fits)))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+convolve = __import__('5-convolve').convolve
+
+
+def convolve_loop(images, kernels, padding=(0, 0), stride=(1, 1)):
+    """the per-kernel/per-pixel tensordot loop convolve used to run"""
+    m, h, w, c = images.shape
+    kh, kw, _, nc = kernels.shape
+    ph, pw = padding
+    sh, sw = stride
+    convolvedW = ((w - kw + (2 * pw)) // sw) + 1
+    convolvedH = ((h - kh + (2 * ph)) // sh) + 1
+    padded = np.pad(images, ((0, 0), (ph, ph), (pw, pw), (0, 0)), 'constant')
+    out = np.zeros((m, convolvedH, convolvedW, nc))
+    for i in range(nc):
+        for x in range(convolvedW):
+            for y in range(convolvedH):
+                shredder = padded[:, sh*y:sh*y + kh, sw*x:sw*x + kw]
+                out[:, y, x, i] = np.tensordot(shredder, kernels[:, :, :, i],
+                                               axes=3)
+    return out
+
+
+def best_of(fn, repeat=3):
+    """fastest wall time of repeat calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    cases = [
+        ((8, 64, 64, 3), (3, 3, 3, 16), (1, 1), (1, 1)),
+        ((8, 64, 64, 3), (5, 5, 3, 16), (2, 2), (2, 2)),
+        ((1, 224, 224, 3), (3, 3, 3, 64), (1, 1), (1, 1)),
+    ]
+    for shape, kshape, padding, stride in cases:
+        images = np.random.randint(0, 256, shape).astype(np.uint8)
+        kernels = np.random.randn(*kshape)
+        loop_t, expected = best_of(
+            lambda: convolve_loop(images, kernels, padding, stride), 1)
+        im2col_t, result = best_of(
+            lambda: convolve(images, kernels, padding, stride))
+        print("images {} kernels {} stride {}".format(shape, kshape, stride))
+        print("\tloop:   {:.4f}s".format(loop_t))
+        print("\tim2col: {:.4f}s".format(im2col_t))
+        print("\tspeedup: {:.1f}x, max abs diff: {:.2e}".format(
+            loop_t / im2col_t, np.abs(result - expected).max()))
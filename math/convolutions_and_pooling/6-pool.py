@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """performs pooling on images"""
 import numpy as np
+window_view = __import__('im2col').window_view
 
 
 def pool(images, kernel_shape, stride, mode='max'):
@@ -23,26 +24,10 @@ def pool(images, kernel_shape, stride, mode='max'):
         avg: indicates average pooling
     Returns: a numpy.ndarray containing the pooled images
     """
-    m = images.shape[0]
-    h = images.shape[1]
-    w = images.shape[2]
-    c = images.shape[3]
-    kh, kw = kernel_shape
-    sh, sw = stride
+    windows = window_view(images, kernel_shape, stride)
 
     if mode == "max":
-        op = np.amax
+        pooledMatrix = windows.max(axis=(3, 4))
     else:
-        op = np.average
-
-    ph, pw = 0, 0
-    pooledW = (w - kw + (2 * pw)) // sw + 1
-    pooledH = (h - kh + (2 * ph)) // sh + 1
-    pooledMatrix = np.zeros((m, pooledH, pooledW, c))
-
-    for i in range(pooledH):
-        for j in range(pooledW):
-            pooledMatrix[:, i, j, :] = op(
-                images[:, sh*i: sh*i+kh, sw*j:sw*j+kw, :], axis=(1, 2)
-                )
-    return pooledMatrix
+        pooledMatrix = windows.mean(axis=(3, 4))
+    return pooledMatrix.astype(np.float64, copy=False)
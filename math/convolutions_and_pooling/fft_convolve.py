@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""FFT convolution with overlap-add tiling and direct/fft method selection"""
+import numpy as np
+convolve_im2col = __import__('im2col').convolve_im2col
+
+# large images are cut into tiles whose FFT is at most this many pixels a side
+MAX_FFT_SIDE = 512
+# cost of one FFT flop relative to copying one element into the im2col
+# matrix: the median of the fits 5-main_fft_benchmark.py prints over its 21
+# cases (0.111, ranging from 0.05 to 0.20) on an x86-64 CPU with numpy 2.4's
+# pocketfft and OpenBLAS; rerun it to recalibrate on other hardware
+FFT_FLOP_COST = 0.11
+
+
+def fft_size(n):
+    """smallest 2^a * 3^b * 5^c >= n, the lengths pocketfft is fastest at"""
+    best = 2 ** int(np.ceil(np.log2(n)))
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def tile_shape(h, w, kh, kw):
+    """
+    picks the tile size (th, tw) and FFT size (fh, fw) used on an
+        (h, w) image: the whole image when it fits in one MAX_FFT_SIDE
+        transform, otherwise tiles whose full convolution with the
+        kernel fills a MAX_FFT_SIDE transform (overlap-add)
+    """
+    fh = fft_size(h + kh - 1)
+    fw = fft_size(w + kw - 1)
+    if fh > MAX_FFT_SIDE and MAX_FFT_SIDE > 2 * (kh - 1):
+        fh = MAX_FFT_SIDE
+    if fw > MAX_FFT_SIDE and MAX_FFT_SIDE > 2 * (kw - 1):
+        fw = MAX_FFT_SIDE
+    return (min(h, fh - kh + 1), min(w, fw - kw + 1)), (fh, fw)
+
+
+def convolve_fft(images, kernels, padding=(0, 0), stride=(1, 1)):
+    """
+    convolves images with every kernel through real 2D FFTs
+
+    images is a numpy.ndarray with shape (m, h, w, c)
+    kernels is a numpy.ndarray with shape (kh, kw, c, nc)
+    padding is a tuple of (ph, pw) of zero padding
+    stride is a tuple of (sh, sw)
+
+    the image is split into (th, tw) tiles; each tile is transformed with
+        np.fft.rfft2, multiplied by the transformed (flipped) kernels and
+        summed over channels in one matmul per frequency, transformed
+        back, and its full convolution is added onto the output at the
+        tile offset (overlap-add). Every stride position is computed and
+        the output is subsampled, so strides do not make it cheaper.
+    Returns: a numpy.ndarray of shape (m, h_out, w_out, nc), the same
+        result convolve_im2col gives up to floating point error
+    """
+    m, h, w, c = images.shape
+    kh, kw, _, nc = kernels.shape
+    ph, pw = padding
+    sh, sw = stride
+
+    padded = np.pad(images.astype(np.float64, copy=False),
+                    ((0, 0), (ph, ph), (pw, pw), (0, 0)), 'constant')
+    h, w = padded.shape[1:3]
+    (th, tw), (fh, fw) = tile_shape(h, w, kh, kw)
+
+    # correlation is convolution with the flipped kernel
+    flipped = kernels[::-1, ::-1].astype(np.float64, copy=False)
+    kernel_f = np.fft.rfft2(flipped, s=(fh, fw), axes=(0, 1))
+
+    full = np.zeros((m, h + kh - 1, w + kw - 1, nc))
+    for y in range(0, h, th):
+        for x in range(0, w, tw):
+            tile = padded[:, y:y + th, x:x + tw]
+            tile_f = np.fft.rfft2(tile, s=(fh, fw), axes=(1, 2))
+            # (m, fh, fw', 1, c) @ (fh, fw', c, nc) sums the channels
+            prod = np.matmul(tile_f[:, :, :, np.newaxis, :], kernel_f)
+            conv = np.fft.irfft2(prod[:, :, :, 0, :], s=(fh, fw), axes=(1, 2))
+            outH = tile.shape[1] + kh - 1
+            outW = tile.shape[2] + kw - 1
+            full[:, y:y + outH, x:x + outW] += conv[:, :outH, :outW]
+
+    valid = full[:, kh - 1:h, kw - 1:w]
+    return valid[:, ::sh, ::sw]
+
+
+def method_costs(shape, kernel_shape, stride=(1, 1)):
+    """
+    the terms of the cost model of choose_method
+
+    shape is the (m, h, w, c) shape of the padded images
+    kernel_shape is the (kh, kw, c, nc) shape of the kernels
+    stride is a tuple of (sh, sw)
+    Returns: the cost of the direct method, in im2col elements copied, and
+        the FFT flops and frequency-domain multiplications of the fft
+        method; the fft cost is FFT_FLOP_COST * flops + multiplications
+    """
+    m, h, w, c = shape
+    kh, kw, _, nc = kernel_shape
+    sh, sw = stride
+    outH = (h - kh) // sh + 1
+    outW = (w - kw) // sw + 1
+
+    # the direct method is bound by building the im2col matrix
+    direct = m * outH * outW * kh * kw * c * (1 + nc / 32)
+
+    (th, tw), (fh, fw) = tile_shape(h, w, kh, kw)
+    tiles = np.ceil(h / th) * np.ceil(w / tw)
+    size = fh * fw
+    transforms = tiles * m * (c + nc) + c * nc
+    flops = 2.5 * size * np.log2(size) * transforms
+    multiplications = tiles * m * size / 2 * c * nc
+    return direct, flops, multiplications
+
+
+def choose_method(shape, kernel_shape, stride=(1, 1)):
+    """
+    estimates whether the direct (im2col) or fft convolution is cheaper
+
+    shape, kernel_shape and stride are those of method_costs
+    Returns: 'fft' or 'direct'
+    """
+    direct, flops, multiplications = method_costs(shape, kernel_shape,
+                                                  stride)
+    if FFT_FLOP_COST * flops + multiplications < direct:
+        return 'fft'
+    return 'direct'
+
+
+def convolve_method(images, kernels, padding=(0, 0), stride=(1, 1),
+                    method='direct'):
+    """
+    convolves images with kernels using the requested method
+
+    images, kernels, padding and stride are the same as for convolve_im2col
+    method is either 'direct' (the default), 'fft' or 'auto'
+        'auto' picks the cheaper of the two with choose_method
+        the fft result differs from the direct one by floating point
+            error; it is rounded when images and kernels are both integer,
+            so integer convolutions stay exact
+    Returns: a numpy.ndarray of shape (m, h_out, w_out, nc)
+    """
+    if method == 'auto':
+        m, h, w, c = images.shape
+        ph, pw = padding
+        method = choose_method((m, h + 2 * ph, w + 2 * pw, c),
+                               kernels.shape, stride)
+    if method == 'fft':
+        result = convolve_fft(images, kernels, padding, stride)
+        if np.issubdtype(images.dtype, np.integer) and \
+                np.issubdtype(kernels.dtype, np.integer):
+            np.rint(result, out=result)
+        return result
+    return convolve_im2col(images, kernels, padding, stride)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""shared im2col convolution engine for the convolution functions"""
+import numpy as np
+
+
+def window_view(padded, kernel_shape, stride):
+    """
+    builds a strided view of every kernel window of padded without copying
+
+    padded is a numpy.ndarray with shape (m, h, w, c)
+        containing the (already padded) images
+    kernel_shape is a tuple of (kh, kw)
+        kh: the height of the kernel
+        kw: the width of the kernel
+    stride is a tuple of (sh, sw)
+        sh: the stride for the height of the image
+        sw: the stride for the width of the image
+    Returns: a read-only view of shape (m, h_out, w_out, kh, kw, c)
+        where view[i, y, x] is the window under the kernel
+        at output position (y, x) of image i
+    """
+    m, h, w, c = padded.shape
+    kh, kw = kernel_shape
+    sh, sw = stride
+
+    outH = (h - kh) // sh + 1
+    outW = (w - kw) // sw + 1
+    sm, sy, sx, sc = padded.strides
+
+    return np.lib.stride_tricks.as_strided(
+        padded,
+        shape=(m, outH, outW, kh, kw, c),
+        strides=(sm, sy * sh, sx * sw, sy, sx, sc),
+        writeable=False)
+
+
+def convolve_im2col(images, kernels, padding=(0, 0), stride=(1, 1)):
+    """
+    convolves images with every kernel at once as a single matrix product
+
+    images is a numpy.ndarray with shape (m, h, w, c)
+        containing multiple images
+    kernels is a numpy.ndarray with shape (kh, kw, c, nc)
+        containing the kernels for the convolution
+    padding is a tuple of (ph, pw)
+        ph: the zero padding added to the top and bottom of the images
+        pw: the zero padding added to the left and right of the images
+    stride is a tuple of (sh, sw)
+        sh: the stride for the height of the image
+        sw: the stride for the width of the image
+
+    the windows are gathered with a strided view (no python loop)
+        and flattened into an im2col matrix of shape
+        (m * h_out * w_out, kh * kw * c); one GEMM against the
+        (kh * kw * c, nc) kernel matrix then computes every output
+        pixel of every kernel
+    Returns: a numpy.ndarray of shape (m, h_out, w_out, nc)
+        containing the convolved images
+    """
+    kh, kw, c, nc = kernels.shape
+    ph, pw = padding
+
+    padded = images.astype(np.float64, copy=False)
+    if ph or pw:
+        padded = np.pad(padded, ((0, 0), (ph, ph), (pw, pw), (0, 0)),
+                        'constant')
+    windows = window_view(padded, (kh, kw), stride)
+    m, outH, outW = windows.shape[:3]
+
+    cols = windows.reshape(m * outH * outW, kh * kw * c)
+    weights = kernels.reshape(kh * kw * c, nc).astype(np.float64, copy=False)
+
+    return np.matmul(cols, weights).reshape(m, outH, outW, nc)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""memory-bounded convolution over chunks of images and tiles of rows"""
+import numpy as np
+convolve_method = __import__('fft_convolve').convolve_method
+
+# default budget for the im2col matrix of a single tile
+TILE_BYTES = 64 * 2 ** 20
+
+
+def convolve_tiled(images, kernels, padding=(0, 0), stride=(1, 1),
+                   method='direct', out=None, batch_size=None, tile_rows=None):
+    """
+    convolves images with kernels one (batch_size, tile_rows) tile at a time
+
+    images is a numpy.ndarray with shape (m, h, w, c), or any array that
+        supports slicing such as a np.memmap
+    kernels is a numpy.ndarray with shape (kh, kw, c, nc)
+    padding is a tuple of (ph, pw) of zero padding
+    stride is a tuple of (sh, sw)
+    method is either 'direct' (the default), 'fft' or 'auto', applied to
+        every tile
+    out is an optional array of shape (m, h_out, w_out, nc), for instance
+        a np.memmap, that the result is written into
+    batch_size is the number of images convolved together
+    tile_rows is the number of output rows computed per tile; by default
+        as many as keep the im2col matrix of a tile under TILE_BYTES
+
+    the padded images are never built: each tile copies only the input rows
+        its output rows read into a reused buffer whose out-of-image rows
+        and columns stay zero, so peak memory depends on the tile size and
+        not on m
+    Returns: out, or a new numpy.ndarray if out is None
+    """
+    m, h, w, c = images.shape
+    kh, kw, _, nc = kernels.shape
+    ph, pw = padding
+    sh, sw = stride
+    outH = (h + 2 * ph - kh) // sh + 1
+    outW = (w + 2 * pw - kw) // sw + 1
+
+    if out is None:
+        out = np.empty((m, outH, outW, nc))
+    elif out.shape != (m, outH, outW, nc):
+        raise ValueError('out must have shape {}'.format((m, outH, outW, nc)))
+    if batch_size is None:
+        batch_size = min(m, 64)
+    if tile_rows is None:
+        row_bytes = batch_size * outW * kh * kw * c * 8
+        tile_rows = max(1, TILE_BYTES // row_bytes)
+    tile_rows = min(tile_rows, outH)
+
+    in_rows = (tile_rows - 1) * sh + kh
+    buffer = np.zeros((batch_size, in_rows, w + 2 * pw, c))
+
+    for i in range(0, m, batch_size):
+        n = min(batch_size, m - i)
+        for r in range(0, outH, tile_rows):
+            rows = min(tile_rows, outH - r)
+            # rows [top, top + span) of the padded image feed this tile
+            top = r * sh - ph
+            span = (rows - 1) * sh + kh
+            first = min(max(top, 0), h)
+            last = max(min(top + span, h), first)
+            # where those image rows land inside the tile
+            a = max(first - top, 0)
+            b = a + last - first
+
+            tile = buffer[:n, :span]
+            tile[:, :a] = 0
+            tile[:, b:] = 0
+            tile[:, a:b, pw:pw + w] = images[i:i + n, first:last]
+
+            out[i:i + n, r:r + rows] = convolve_method(
+                tile, kernels, (0, 0), stride, method)
+    return out
@@ -17,7 +17,7 @@ class RNNCell:
     """
     represents a cell of a simple RNN
     """
-    def __init__(self, i, h, o):
+    def __init__(self, i, h, o, dtype=np.float64):
         """
         i is the dimensionality of the data
         h is the dimensionality of the hidden state
@@ -30,6 +30,9 @@ class RNNCell:
             in the order listed above
         The weights will be used on the right side for matrix multiplication
         The biases should be initialized as zeros
+        dtype is the floating point type of the weights and biases,
+            float32 halves their memory; inputs are cast to it so the
+            hidden states and outputs keep it too
         """
         # i + h = h_prev + x_t
         #     = total number of features input in RNNCell at each time step
@@ -37,10 +40,10 @@ class RNNCell:
         #     (in a simple RNN, input at step
         #       is current data point concat w/ prev data point)
         # i + h rows and h columns
-        self.Wh = np.random.normal(size=(i + h, h))
-        self.bh = np.zeros(shape=(1, h))
-        self.Wy = np.random.normal(size=(h, o))
-        self.by = np.zeros(shape=(1, o))
+        self.Wh = np.random.normal(size=(i + h, h)).astype(dtype, copy=False)
+        self.bh = np.zeros(shape=(1, h), dtype=dtype)
+        self.Wy = np.random.normal(size=(h, o)).astype(dtype, copy=False)
+        self.by = np.zeros(shape=(1, o), dtype=dtype)
 
     def forward(self, h_prev, x_t):
         """
@@ -57,7 +60,8 @@ class RNNCell:
         # concatenate previous hidden state and current input
         # why? an RNN cell considers both the new input
         #   and the past context when making predictions
-        inputAndPrevState_combined = np.concatenate((h_prev, x_t), axis=1)
+        inputAndPrevState_combined = np.concatenate(
+            (h_prev, x_t), axis=1, dtype=self.Wh.dtype)
 
         # calc next hidden state by multiplying inputAndPrevState_combined by
         #   weight matrix for hidden state and adding bias
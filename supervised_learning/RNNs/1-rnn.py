@@ -24,11 +24,13 @@ def rnn(rnn_cell, X, h_0):
     t, m, i = X.shape
     _, h = h_0.shape
 
-    H = np.zeros((t + 1, m, h))
+    # the states and outputs keep the dtype of the cell's weights
+    dtype = rnn_cell.Wy.dtype
+    H = np.zeros((t + 1, m, h), dtype=dtype)
     H[0] = h_0  # initial hidden state
 
     _, o = rnn_cell.Wy.shape
-    Y = np.zeros((t, m, o))
+    Y = np.zeros((t, m, o), dtype=dtype)
 
     for timeStep in range(t):
         # update hidden state and output using RNNCell's forward method
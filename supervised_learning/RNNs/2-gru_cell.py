@@ -10,7 +10,7 @@ class GRUCell:
     represents a gated recurrent unit
     """
 
-    def __init__(self, i, h, o):
+    def __init__(self, i, h, o, dtype=np.float64):
         """
         i is the dimensionality of the data
         h is the dimensionality of the hidden state
@@ -24,15 +24,18 @@ class GRUCell:
             in the order listed above
         The weights will be used on the right side for matrix multiplication
         The biases should be initialized as zeros
+        dtype is the floating point type of the weights and biases,
+            float32 halves their memory; inputs are cast to it so the
+            hidden states and outputs keep it too
         """
-        self.Wz = np.random.randn(i + h, h)
-        self.bz = np.zeros((1, h))
-        self.Wr = np.random.randn(i + h, h)
-        self.br = np.zeros((1, h))
-        self.Wh = np.random.randn(i + h, h)
-        self.bh = np.zeros((1, h))
-        self.Wy = np.random.randn(h, o)
-        self.by = np.zeros((1, o))
+        self.Wz = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bz = np.zeros((1, h), dtype=dtype)
+        self.Wr = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.br = np.zeros((1, h), dtype=dtype)
+        self.Wh = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bh = np.zeros((1, h), dtype=dtype)
+        self.Wy = np.random.randn(h, o).astype(dtype, copy=False)
+        self.by = np.zeros((1, o), dtype=dtype)
 
     def forward(self, h_prev, x_t):
         """
@@ -47,6 +50,9 @@ class GRUCell:
             h_next is the next hidden state
             y is the output of the cell
         """
+        x_t = x_t.astype(self.Wz.dtype, copy=False)
+        h_prev = h_prev.astype(self.Wz.dtype, copy=False)
+
         # update Gate
         #   combines input and previous hidden state to update cell's memory
         updateInput = x_t @ self.Wz[h_prev.shape[1]:, :]
@@ -9,7 +9,7 @@ class LSTMCell:
     """
     represents an LSTM unit
     """
-    def __init__(self, i, h, o):
+    def __init__(self, i, h, o, dtype=np.float64):
         """
         i is the dimensionality of the data
         h is the dimensionality of the hidden state
@@ -25,17 +25,20 @@ class LSTMCell:
             in the order listed above
         The weights will be used on the right side for matrix multiplication
         The biases should be initialized as zeros
+        dtype is the floating point type of the weights and biases,
+            float32 halves their memory; inputs are cast to it so the
+            hidden states and outputs keep it too
         """
-        self.Wf = np.random.randn(i + h, h)
-        self.bf = np.zeros((1, h))
-        self.Wu = np.random.randn(i + h, h)
-        self.bu = np.zeros((1, h))
-        self.Wc = np.random.randn(i + h, h)
-        self.bc = np.zeros((1, h))
-        self.Wo = np.random.randn(i + h, h)
-        self.bo = np.zeros((1, h))
-        self.Wy = np.random.randn(h, o)
-        self.by = np.zeros((1, o))
+        self.Wf = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bf = np.zeros((1, h), dtype=dtype)
+        self.Wu = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bu = np.zeros((1, h), dtype=dtype)
+        self.Wc = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bc = np.zeros((1, h), dtype=dtype)
+        self.Wo = np.random.randn(i + h, h).astype(dtype, copy=False)
+        self.bo = np.zeros((1, h), dtype=dtype)
+        self.Wy = np.random.randn(h, o).astype(dtype, copy=False)
+        self.by = np.zeros((1, o), dtype=dtype)
 
     def forward(self, h_prev, c_prev, x_t):
         """
@@ -54,7 +57,9 @@ class LSTMCell:
         """
         # using concatenate to merge the previous hidden state w/ new input
         #   this is crucial for maintaining the temporal aspect of the LSTM
-        combined = np.concatenate((h_prev, x_t), axis=1)
+        combined = np.concatenate((h_prev, x_t), axis=1,
+                                  dtype=self.Wf.dtype)
+        c_prev = c_prev.astype(self.Wf.dtype, copy=False)
 
         # forget gate: decides which information to discard from the cell state
         #   using sigmoid as it outputs values between 0 and 1,ideal for gating
@@ -30,13 +30,16 @@ def deep_rnn(rnn_cells, X, h_0):
 
     # initialize hidden states, including the initial state
     #   extra time step added for initial hidden state
-    H = np.zeros((numTimeSteps + 1, numLayers, batchSize, hiddenSize))
+    #   and kept in the dtype of the cells' weights
+    dtype = rnn_cells[-1].Wy.dtype
+    H = np.zeros((numTimeSteps + 1, numLayers, batchSize, hiddenSize),
+                 dtype=dtype)
     H[0] = h_0
 
     # preparing to store outputs
     outputSize = rnn_cells[-1].Wy.shape[1]  # determine out size of last layer
     # initialize Y matrix (for output storage) w/ zeros using extracted dims
-    Y = np.zeros((numTimeSteps, batchSize, outputSize))
+    Y = np.zeros((numTimeSteps, batchSize, outputSize), dtype=dtype)
 
     # loop through each time step
     for timeStep in range(numTimeSteps):
@@ -10,7 +10,7 @@ class BidirectionalCell:
     represents a bidirectional cell of an RNN
     """
 
-    def __init__(self, i, h, o):
+    def __init__(self, i, h, o, dtype=np.float64):
         """
         i is the dimensionality of the data
         h is the dimensionality of the hidden states
@@ -24,13 +24,19 @@ class BidirectionalCell:
             in the order listed above
         The weights will be used on the right side for matrix multiplication
         The biases should be initialized as zeros
+        dtype is the floating point type of the weights and biases,
+            float32 halves their memory; inputs are cast to it so the
+            hidden states and outputs keep it too
         """
-        self.Whf = np.random.randn(h + i, h)  # weights for forward direction
-        self.bhf = np.zeros((1, h))  # bias for forward direction
-        self.Whb = np.random.randn(h + i, h)  # weights for backward direction
-        self.bhb = np.zeros((1, h))  # bias for backward direction
-        self.Wy = np.random.randn(2 * h, o)  # weights for outputs
-        self.by = np.zeros((1, o))  # bias for outputs
+        # weights and bias for forward direction
+        self.Whf = np.random.randn(h + i, h).astype(dtype, copy=False)
+        self.bhf = np.zeros((1, h), dtype=dtype)
+        # weights and bias for backward direction
+        self.Whb = np.random.randn(h + i, h).astype(dtype, copy=False)
+        self.bhb = np.zeros((1, h), dtype=dtype)
+        # weights and bias for outputs
+        self.Wy = np.random.randn(2 * h, o).astype(dtype, copy=False)
+        self.by = np.zeros((1, o), dtype=dtype)
 
     def forward(self, h_prev, x_t):
         """
@@ -43,7 +49,8 @@ class BidirectionalCell:
         Returns: h_next, the next hidden state
         """
         # combine previous hidden state with input
-        combinedInput = np.concatenate((h_prev, x_t), axis=1)
+        combinedInput = np.concatenate((h_prev, x_t), axis=1,
+                                       dtype=self.Whf.dtype)
         # apply activation function to product of combinedInput and Whf + bhf
         h_next = np.tanh(combinedInput @ self.Whf + self.bhf)
         # return next hidden state
@@ -60,7 +67,8 @@ class BidirectionalCell:
         Returns: h_prev, the previous hidden state
         """
         # combine next hidden state with input
-        combinedInput = np.concatenate((h_next, x_t), axis=1)
+        combinedInput = np.concatenate((h_next, x_t), axis=1,
+                                       dtype=self.Whb.dtype)
         # apply activation function to product of combinedInput and Whb + bhb
         #     (weighted sum of inputs and hidden state)
         h_prev = np.tanh(combinedInput @ self.Whb + self.bhb)
@@ -79,8 +87,10 @@ class BidirectionalCell:
             h is the dimensionality of the hidden states
         Returns: Y, the outputs
         """
-        Y = H @ self.Wy + self.by
+        Y = H.astype(self.Wy.dtype, copy=False) @ self.Wy + self.by
 
-        Y = np.exp(Y) / np.sum(np.exp(Y), axis=2, keepdims=True)
+        # softmax, shifted by the max so exp cannot overflow in float32
+        Y = np.exp(Y - np.max(Y, axis=2, keepdims=True))
+        Y /= np.sum(Y, axis=2, keepdims=True)
 
         return Y
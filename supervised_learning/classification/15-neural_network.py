@@ -2,6 +2,9 @@
 """creating nodes in a network.... networking....a neural network"""
 import numpy as np
 import matplotlib.pyplot as plt
+iterate_batches = __import__('batches').iterate_batches
+mean_cost = __import__('batches').mean_cost
+evaluate_batches = __import__('batches').evaluate_batches
 
 
 class NeuralNetwork:
@@ -9,7 +12,7 @@ class NeuralNetwork:
     defines a neural network with one hidden layer
     performing binary classification
     """
-    def __init__(self, nx, nodes):
+    def __init__(self, nx, nodes, dtype=np.float64):
         """
         initialize a neural network
         nx: the number of input features
@@ -23,6 +26,8 @@ class NeuralNetwork:
         b2: The bias of the output neuron. Initialized to 0.
         A2: The activated output of the output neuron (prediction).
             Initialized to 0.
+        dtype: floating point type of the weights, activations and
+            gradients; inputs are cast to it, the cost is summed in float64
         """
         if not isinstance(nx, int):
             raise TypeError("nx must be an integer")
@@ -32,10 +37,12 @@ class NeuralNetwork:
             raise TypeError("nodes must be an integer")
         if nodes < 1:
             raise ValueError("nodes must be a positive integer")
-        self.__W1 = np.random.randn(nodes, nx)
-        self.__b1 = np.zeros(shape=(nodes, 1))
+        if not np.issubdtype(dtype, np.floating):
+            raise TypeError("dtype must be a floating point type")
+        self.__W1 = np.random.randn(nodes, nx).astype(dtype, copy=False)
+        self.__b1 = np.zeros(shape=(nodes, 1), dtype=dtype)
         self.__A1 = 0
-        self.__W2 = np.random.randn(1, nodes)
+        self.__W2 = np.random.randn(1, nodes).astype(dtype, copy=False)
         self.__b2 = 0
         self.__A2 = 0
 
@@ -74,6 +81,7 @@ class NeuralNetwork:
         # Z1 is the result of the dot product
         #   of weights and input data plus the bias
         # represents the input of the activation function of the hidden layer
+        X = X.astype(self.__W1.dtype, copy=False)
         Z1 = np.matmul(self.__W1, X) + self.__b1
 
         # Apply the sigmoid activation function to Z1 to get A1
@@ -107,7 +115,9 @@ class NeuralNetwork:
 
         # Calculation of the cost using the logistic regression cost function
         # Note: To avoid division by zero errors,
-        #   we use 1.0000001 - A instead of 1 - A
+        #   we use 1.0000001 - A instead of 1 - A,
+        #   in float64 where that offset is representable
+        A = A.astype(np.float64, copy=False)
         cost = -1/m * np.sum(Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A))
 
         return cost
@@ -150,8 +160,9 @@ class NeuralNetwork:
         Updates the private attributes __W1, __b1, __W2, and __b2
         """
         m = X.shape[1]
+        X = X.astype(self.__W1.dtype, copy=False)
         # Calculate the dif between the predicted output and the actual output
-        dZ2 = A2 - Y
+        dZ2 = np.subtract(A2, Y, dtype=self.__W1.dtype)
         # Calculate the derivative of the cost with respect to W2
         dW2 = np.dot(dZ2, A1.T) / m
         # derivative of the cost with respect to b2
@@ -173,7 +184,8 @@ class NeuralNetwork:
         self.__b2 = self.__b2 - alpha * db2
 
     def train(self, X, Y, iterations=5000,
-              alpha=0.05, verbose=True, graph=True, step=100):
+              alpha=0.05, verbose=True, graph=True, step=100,
+              batch_size=None, shuffle=False):
         """
         Trains the neural network
         X: numpy.ndarray with shape (nx, m) that contains the input data
@@ -181,6 +193,13 @@ class NeuralNetwork:
             that contains the correct labels for the input data
         iterations: number of iterations to train over
         alpha: learning rate
+        batch_size: number of examples per gradient descent step,
+            None for full-batch gradient descent
+        shuffle: whether to visit the examples in a new random order
+            every iteration
+        X may also be a stream of (X, Y) chunks with Y set to None
+            (see batches.iterate_batches); each iteration is then one
+            pass over the stream and the cost is the mean over its batches
         Returns the evaluation of the training data after iterations complete
         """
         if not isinstance(iterations, int):
@@ -199,24 +218,38 @@ class NeuralNetwork:
             if step <= 0 or step > iterations:
                 raise ValueError("step must be positive and <= iterations")
 
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError("batch_size must be an integer")
+            if batch_size <= 0:
+                raise ValueError("batch_size must be positive")
+
         costs = []
 
         # training iterations
         for i in range(iterations):
-            # Forward propagation
-            A1, A2 = self.forward_prop(X)
-            # Cost calculation
-            cost = self.cost(Y, A2)
-            # Backpropagation (gradient descent)
-            self.gradient_descent(X, Y, A1, A2, alpha)
+            report = verbose and i % step == 0
+            batch_costs = []
+            batch_sizes = []
+            for X_batch, Y_batch in iterate_batches(X, Y, batch_size,
+                                                    shuffle):
+                # Forward propagation
+                A1, A2 = self.forward_prop(X_batch)
+                # Cost calculation
+                if report:
+                    batch_costs.append(self.cost(Y_batch, A2))
+                    batch_sizes.append(Y_batch.shape[1])
+                # Backpropagation (gradient descent)
+                self.gradient_descent(X_batch, Y_batch, A1, A2, alpha)
 
             # Print the cost every `step` iterations
-            if verbose and i % step == 0:
+            if report:
+                cost = mean_cost(batch_costs, batch_sizes)
                 print("Cost after {} iterations: {}".format(i, cost))
                 costs.append(cost)
 
         # Evaluate the training
-        A2, cost = self.evaluate(X, Y)
+        A2, cost = evaluate_batches(self.evaluate, X, Y, batch_size)
 
         # If graph is True, plot the cost per step
         if graph:
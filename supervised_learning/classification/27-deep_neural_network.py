@@ -3,6 +3,8 @@
 import pickle
 import numpy as np
 import matplotlib.pyplot as plt
+softmax = __import__('softmax_cross_entropy').softmax
+cross_entropy = __import__('softmax_cross_entropy').cross_entropy
 
 
 class DeepNeuralNetwork:
@@ -68,8 +70,7 @@ class DeepNeuralNetwork:
             # Compute the activation (a) for the current layer
             if layer == self.L:
                 # For the output layer, use the softmax activation function
-                t = np.exp(z)
-                self.__cache["A{}".format(layer)] = t/np.sum(t, axis=0)
+                self.__cache["A{}".format(layer)] = softmax(z, out=z)
             else:
                 # For the hidden layers, use the sigmoid activation function
                 self.__cache["A{}".format(layer)] = 1 / (1 + np.exp(-z))
@@ -85,9 +86,7 @@ class DeepNeuralNetwork:
             containing the activated output of the neuron of each example
         Returns the cost of the model as a float
         """
-        m = Y.shape[1]
-        cost = -1 / m * np.sum(Y * np.log(A))
-        return cost
+        return cross_entropy(Y, A)
 
     def evaluate(self, X, Y):
         """
@@ -1,15 +1,43 @@
 #!/usr/bin/env python3
 """are you winning at neural networks son?"""
+import json
 import pickle
 import numpy as np
 import matplotlib.pyplot as plt
+iterate_batches = __import__('batches').iterate_batches
+mean_cost = __import__('batches').mean_cost
+evaluate_batches = __import__('batches').evaluate_batches
+DataParallel = __import__('data_parallel').DataParallel
+softmax = __import__('softmax_cross_entropy').softmax
+cross_entropy = __import__('softmax_cross_entropy').cross_entropy
+softmax_cross_entropy = __import__(
+    'softmax_cross_entropy').softmax_cross_entropy
+
+# save/load weight file layout:
+#   MAGIC, little-endian uint32 header length, JSON header,
+#   zero padding up to a multiple of ALIGN bytes, then the raw C-order
+#   weights W1, b1, W2, b2, ... of the dtype named in the header
+MAGIC = b'\x93DNNW'
+FORMAT_VERSION = 1
+ALIGN = 64
 
 
 class DeepNeuralNetwork:
     """
     defines a deep neural network performing binary classification
     """
-    def __init__(self, nx, layers, activation='sig'):
+    # the methods profiler.Profiler.attach times, and the phase each is
+    # recorded as: the fused training step is made of the _forward,
+    # _output_delta, _backward and _update hooks, so its forward pass and
+    # cost show up as forward_prop and cost, and its gradient descent as
+    # backward_prop and update
+    PHASES = {'forward_prop': 'forward_prop', 'cost': 'cost',
+              'gradient_descent': 'gradient_descent',
+              'gradients': 'gradients', 'evaluate': 'evaluate',
+              '_forward': 'forward_prop', '_output_delta': 'cost',
+              '_backward': 'backward_prop', '_update': 'update'}
+
+    def __init__(self, nx, layers, activation='sig', dtype=np.float64):
         """
         L: number of layers in the neural network
         cache: A dictionary to hold all intermediary values of the network.
@@ -24,6 +52,10 @@ class DeepNeuralNetwork:
                     where {1} is the hiddne layer the bias belongs to
         activation: The activation function to be used in the hidden layers.
             'sig' for sigmoid function and 'tanh' for tanh function.
+        dtype: The floating point type of the weights, activations and
+            gradients, float64 by default; with np.float32 the whole
+            forward and backward pass runs in float32 (inputs are cast
+            to it per batch) while costs are still summed in float64
         """
         if not isinstance(nx, int):
             raise TypeError("nx must be an integer")
@@ -35,16 +67,35 @@ class DeepNeuralNetwork:
             raise TypeError("layers must be a list of positive integers")
         if activation not in ['sig', 'tanh']:
             raise ValueError("activation must be 'sig' or 'tanh'")
+        if not np.issubdtype(dtype, np.floating):
+            raise TypeError("dtype must be a floating point type")
         self.__L = len(layers)
         self.__cache = {}
         self.__weights = {}
         self.__activation = activation
+        self.__buffers = {}
         for i in range(self.__L):
-            self.__weights['W' + str(i+1)] = np.random.randn(
-                layers[i], nx) * np.sqrt(2/nx)
-            self.__weights['b' + str(i+1)] = np.zeros((layers[i], 1))
+            self.__weights['W' + str(i+1)] = (np.random.randn(
+                layers[i], nx) * np.sqrt(2/nx)).astype(dtype, copy=False)
+            self.__weights['b' + str(i+1)] = np.zeros((layers[i], 1),
+                                                      dtype=dtype)
             nx = layers[i]
 
+    def __getstate__(self):
+        """Pickles the network without its scratch buffers"""
+        state = self.__dict__.copy()
+        state['_DeepNeuralNetwork__buffers'] = {}
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled network, including pickles written before
+            the cache was keyed by layer index
+        """
+        state['_DeepNeuralNetwork__buffers'] = {}
+        state['_DeepNeuralNetwork__cache'] = {}
+        self.__dict__.update(state)
+
     @property
     def L(self):
         return self.__L
@@ -61,24 +112,88 @@ class DeepNeuralNetwork:
     def activation(self):
         return self.__activation
 
+    def buffers(self, m):
+        """
+        Returns the per-layer work buffers for a batch of m examples
+        The (nodes, m) buffers are contiguous views of the first nodes * m
+            elements of one allocation per layer, sized for the largest
+            batch seen so far, so a smaller batch (e.g. the last one of an
+            epoch) allocates nothing; everything is allocated again only
+            if the dtype or the weight arrays change
+        buffers is a dict of lists indexed by layer number:
+            A[layer]: activations of the layer, shape (nodes, m)
+            dZ[layer]: gradient of the layer's pre-activation, (nodes, m)
+            dA[layer]: activation derivative scratch space, (nodes, m)
+            dW[layer], db[layer]: gradients of the layer's parameters
+        """
+        dtype = self.__weights['W1'].dtype
+        buffers = self.__buffers
+        if buffers and (buffers['dtype'] != dtype or
+                        not all(buffers['W'][layer] is
+                                self.__weights['W{}'.format(layer)]
+                                for layer in range(1, self.__L + 1))):
+            buffers = {}
+        if buffers and buffers['m'] == m:
+            return buffers
+
+        if not buffers or buffers['capacity'] < m:
+            W = [None] + [self.__weights['W{}'.format(layer)]
+                          for layer in range(1, self.__L + 1)]
+            b = [None] + [self.__weights['b{}'.format(layer)]
+                          for layer in range(1, self.__L + 1)]
+            buffers = {'capacity': m, 'dtype': dtype, 'W': W, 'b': b,
+                       'storage': [None], 'dW': [None], 'db': [None]}
+            for layer in range(1, self.__L + 1):
+                nodes = W[layer].shape[0]
+                buffers['storage'].append(
+                    np.empty((3, nodes * m), dtype=dtype))
+                buffers['dW'].append(np.empty_like(W[layer]))
+                buffers['db'].append(np.empty_like(b[layer]))
+
+        buffers.update(m=m, A=[None], dZ=[None], dA=[None])
+        for layer in range(1, self.__L + 1):
+            nodes = buffers['W'][layer].shape[0]
+            storage = buffers['storage'][layer][:, :nodes * m]
+            buffers['A'].append(storage[0].reshape(nodes, m))
+            buffers['dZ'].append(storage[1].reshape(nodes, m))
+            buffers['dA'].append(storage[2].reshape(nodes, m))
+        self.__buffers = buffers
+        return buffers
+
     def forward_prop(self, X):
-        """Forward Propagation"""
-        self.__cache.update({"A0": X})
-        for layer in range(1, self.L+1):
-            weights_current_layer = self.weights["W{}".format(layer)]
-            activations_previous_layer = self.cache["A{}".format(layer-1)]
-            biases_current_layer = self.weights["b{}".format(layer)]
-            z = np.matmul(weights_current_layer,
-                          activations_previous_layer) + biases_current_layer
-            if layer == self.L:
-                t = np.exp(z)
-                self.__cache["A{}".format(layer)] = t/np.sum(t, axis=0)
-            else:
-                if self.__activation == 'sig':
-                    self.__cache["A{}".format(layer)] = 1 / (1 + np.exp(-z))
-                elif self.__activation == 'tanh':
-                    self.__cache["A{}".format(layer)] = np.tanh(z)
-        return self.cache["A{}".format(self.L)], self.cache
+        """
+        Forward Propagation
+        Activations are written into preallocated buffers, so the arrays
+            returned are overwritten by the next call to forward_prop
+        The cache is keyed by layer index: cache[0] is X,
+            cache[layer] is the activation of that layer
+        """
+        z = self._forward(X)
+        softmax(z, out=z)
+        return self.__cache[self.__L], self.__cache
+
+    def _forward(self, X):
+        """
+        Forward propagation up to the output layer's pre-activation,
+            which is left in the output layer's activation buffer
+        Returns that buffer
+        """
+        buffers = self.buffers(X.shape[1])
+        W, b, A = buffers['W'], buffers['b'], buffers['A']
+        self.__cache[0] = X.astype(buffers['dtype'], copy=False)
+        for layer in range(1, self.__L + 1):
+            z = A[layer]
+            np.matmul(W[layer], self.__cache[layer - 1], out=z)
+            z += b[layer]
+            if layer < self.__L and self.__activation == 'sig':
+                np.negative(z, out=z)
+                np.exp(z, out=z)
+                z += 1
+                np.reciprocal(z, out=z)
+            elif layer < self.__L and self.__activation == 'tanh':
+                np.tanh(z, out=z)
+            self.__cache[layer] = z
+        return z
 
     def cost(self, Y, A):
         """
@@ -89,9 +204,7 @@ class DeepNeuralNetwork:
             containing the activated output of the neuron of each example
         Returns the cost of the model as a float
         """
-        m = Y.shape[1]
-        cost = -1 / m * np.sum(Y * np.log(A))
-        return cost
+        return cross_entropy(Y, A)
 
     def evaluate(self, X, Y):
         """
@@ -104,7 +217,7 @@ class DeepNeuralNetwork:
         # Compute the forward propagation and get the final activation value
         final_activation = self.forward_prop(X)[0]
         # Get the indices of the maximum activation value for each example
-        max_activation_indices = np.argmax(self.cache["A3"], axis=0)
+        max_activation_indices = np.argmax(final_activation, axis=0)
         max_activation_indices.reshape(max_activation_indices.size, 1)
         # Create an array of indices for each example
         example_indices = np.arange(final_activation.shape[1])
@@ -115,7 +228,7 @@ class DeepNeuralNetwork:
         hard_max[max_activation_indices, example_indices] = 1
         # Return the predictions (as a binary matrix) and the cost
         return (hard_max.astype(int),
-                self.cost(Y, self.cache["A{}".format(self.L)]))
+                self.cost(Y, final_activation))
 
     def gradient_descent(self, Y, cache, alpha=0.05):
         """
@@ -126,46 +239,90 @@ class DeepNeuralNetwork:
         alpha: the learning rate
         Updates the private attribute __weights
         """
-        m = Y.shape[1]
+        buffers = self.buffers(Y.shape[1])
+        # For the output layer, the gradient is
+        #   the difference between the activations and the labels
+        np.subtract(cache[self.__L], Y, out=buffers['dZ'][self.__L])
+        self._backward(cache)
+        self._update(buffers, alpha)
+
+    def gradients(self, X, Y):
+        """
+        One forward and backward pass over a batch, without updating
+            the weights: the softmax output, its cost and its gradient
+            come from a single fused softmax_cross_entropy call
+        X: a numpy.ndarray with shape (nx, m) that contains the input data
+        Y: a numpy.ndarray with shape (classes, m) of one-hot labels
+        The gradients of the mean cost are left in the dW and db lists
+            of self.buffers(m)
+        Returns the cost of the batch
+        """
+        cost = self._output_delta(self._forward(X), Y)
+        self._backward(self.__cache)
+        return cost
+
+    def _output_delta(self, z, Y):
+        """
+        Turns the output layer's pre-activation z into the softmax output
+            in place, with the gradient of the mean cost with respect to
+            z left in dZ[L] of the buffers, in one fused pass
+        Returns the cost of the batch
+        """
+        dZ = self.buffers(Y.shape[1])['dZ'][self.__L]
+        return softmax_cross_entropy(z, Y, A=z, dZ=dZ)[1]
+
+    def __step(self, X, Y, alpha):
+        """
+        One gradient descent step over a batch
+        Returns the cost of the batch before the update
+        """
+        cost = self.gradients(X, Y)
+        self._update(self.buffers(X.shape[1]), alpha)
+        return cost
+
+    def _update(self, buffers, alpha):
+        """Applies the gradients in buffers to the weights in place"""
+        for layer in range(1, self.__L + 1):
+            buffers['dW'][layer] *= alpha
+            buffers['W'][layer] -= buffers['dW'][layer]
+            buffers['db'][layer] *= alpha
+            buffers['b'][layer] -= buffers['db'][layer]
+
+    def _backward(self, cache):
+        """
+        Backpropagates the output layer's gradient, already in
+            dZ[L] of the buffers, into the gradients dW and db
+            of every layer
+        """
+        m = cache[0].shape[1]
+        buffers = self.buffers(m)
+        W, dZ, dA = buffers['W'], buffers['dZ'], buffers['dA']
+        dW, db = buffers['dW'], buffers['db']
         # Loop over each layer in the network in reverse order
         for layer in reversed(range(1, self.__L + 1)):
-            # Retrieve the activations for the current and previous layer
-            activations_current_layer = cache['A' + str(layer)]
-            activations_previous_layer = cache['A' + str(layer - 1)]
-            # Retrieve the weights for the current layer
-            weights_current_layer = self.__weights['W' + str(layer)]
-            # Compute the gradient of the activation function
-            if layer == self.__L:
-                # For the output layer, the gradient is
-                #   the difference between the activations and the labels
-                gradient = activations_current_layer - Y
-            else:
-                # For the hidden layers, gradient is the product of
-                #   the derivative of activation func and prev gradient
-                if self.__activation == 'sig':
-                    gradient = gradient_previous_layer * \
-                               self.sigmoid_derivative(
-                                activations_current_layer
-                                )
-                elif self.__activation == 'tanh':
-                    gradient = gradient_previous_layer * \
-                               (1 - activations_current_layer ** 2)
             # Compute the gradients of the weights and biases
-            gradient_weights = np.dot(
-                gradient, activations_previous_layer.T
-                ) / m
-            gradient_biases = np.sum(gradient, axis=1, keepdims=True) / m
-            # If not at the first layer, compute gradient for previous layer
+            np.matmul(dZ[layer], cache[layer - 1].T, out=dW[layer])
+            dW[layer] /= m
+            np.sum(dZ[layer], axis=1, keepdims=True, out=db[layer])
+            db[layer] /= m
+            # If not at the first layer, compute gradient for previous layer:
+            #   the product of the backpropagated gradient
+            #   and the activation derivative
             if layer > 1:
-                gradient_previous_layer = np.dot(
-                    weights_current_layer.T, gradient
-                    )
-            # Update the weights and biases
-            self.__weights['W' + str(layer)] -= alpha * gradient_weights
-            self.__weights['b' + str(layer)] -= alpha * gradient_biases
+                np.matmul(W[layer].T, dZ[layer], out=dZ[layer - 1])
+                A_prev = cache[layer - 1]
+                if self.__activation == 'sig':
+                    np.subtract(1, A_prev, out=dA[layer - 1])
+                    dA[layer - 1] *= A_prev
+                elif self.__activation == 'tanh':
+                    np.square(A_prev, out=dA[layer - 1])
+                    np.subtract(1, dA[layer - 1], out=dA[layer - 1])
+                dZ[layer - 1] *= dA[layer - 1]
 
     def train(self, X, Y, iterations=5000,
-              alpha=0.05, verbose=True, graph=True, step=100):
+              alpha=0.05, verbose=True, graph=True, step=100,
+              batch_size=None, shuffle=False, workers=None,
+              early_stopping=None, validation=None):
         """
         Trains the deep neural network
         X: a numpy.ndarray with shape
@@ -179,6 +336,21 @@ class DeepNeuralNetwork:
         graph: boolean that defines whether or not
             to graph information about the training
         step: the interval of printing information and updating the graph
+        batch_size: number of examples per gradient descent step,
+            None for full-batch gradient descent
+        shuffle: whether to visit the examples in a new random order
+            every iteration
+        X may also be a stream of (X, Y) chunks with Y set to None
+            (see batches.iterate_batches); each iteration is then one
+            pass over the stream and the cost is the mean over its batches
+        workers: number of processes each batch is sharded across
+            (see data_parallel.DataParallel), None to train in this process
+        early_stopping: an early_stopping.EarlyStopping controller, which
+            is given the cost on validation every time it is due; training
+            stops when it says so, and the weights with the lowest
+            validation cost are restored at the end
+        validation: tuple (X_valid, Y_valid) of validation data,
+            required with early_stopping
         Updates the private attributes __weights and __cache
         Returns the evaluation of the training data
             after iterations of training have occurred
@@ -196,43 +368,138 @@ class DeepNeuralNetwork:
                 raise TypeError("step must be an integer")
             if step <= 0 or step > iterations:
                 raise ValueError("step must be positive and <= iterations")
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError("batch_size must be an integer")
+            if batch_size <= 0:
+                raise ValueError("batch_size must be positive")
+        if early_stopping is not None and validation is None:
+            raise ValueError("early_stopping needs validation data")
+        parallel = None if workers is None else DataParallel(self, workers)
+        descend = self.__step if parallel is None else parallel.step
         costs = []
-        for i in range(iterations):
-            A, cache = self.forward_prop(X)
-            self.gradient_descent(Y, cache, alpha)
-            if i % step == 0 or i == iterations:
-                cost = self.cost(Y, A)
-                costs.append(cost)
-                if verbose is True:
-                    print("Cost after {} iterations: {}".format(i, cost))
+        try:
+            for i in range(iterations):
+                report = i % step == 0 or i == iterations
+                batch_costs = []
+                batch_sizes = []
+                for X_batch, Y_batch in iterate_batches(X, Y, batch_size,
+                                                        shuffle):
+                    cost = descend(X_batch, Y_batch, alpha)
+                    if report:
+                        batch_costs.append(cost)
+                        batch_sizes.append(Y_batch.shape[1])
+                if report:
+                    cost = mean_cost(batch_costs, batch_sizes)
+                    costs.append(cost)
+                    if verbose is True:
+                        print("Cost after {} iterations: {}".format(i, cost))
+                if early_stopping is not None and early_stopping.due(i):
+                    if parallel is not None:
+                        parallel.sync()
+                    if early_stopping.update(self.evaluate(*validation)[1],
+                                             self.__weights):
+                        break
+        finally:
+            if parallel is not None:
+                parallel.close()
+        if early_stopping is not None:
+            early_stopping.restore(self.__weights)
 
         if graph is True:
-            plt.plot(np.arange(0, iterations + 1, step), costs)
+            plt.plot(np.arange(len(costs)) * step, costs)
             plt.xlabel('iteration')
             plt.ylabel('cost')
             plt.title('Training Cost')
             plt.show()
 
-        return self.evaluate(X, Y)
+        return evaluate_batches(self.evaluate, X, Y, batch_size)
 
     def save(self, filename):
-        """Saves the instance object to a file in pickle format"""
+        """
+        Saves the network's weights to a file
+        Only the weights are written, not the cache: a small header
+            (format version, layer sizes, activation, dtype) followed by
+            the raw weight arrays, aligned so load can memory-map them
+        """
         if not filename.endswith('.pkl'):
             filename += '.pkl'
+        arrays = []
+        for layer in range(1, self.__L + 1):
+            arrays.append(self.__weights['W{}'.format(layer)])
+            arrays.append(self.__weights['b{}'.format(layer)])
+        dtype = np.result_type(*arrays)
+        header = {'version': FORMAT_VERSION,
+                  'nx': arrays[0].shape[1],
+                  'layers': [W.shape[0] for W in arrays[::2]],
+                  'activation': self.__activation,
+                  'dtype': dtype.str}
+        header = json.dumps(header).encode('utf-8')
+        start = len(MAGIC) + 4 + len(header)
+        header += b' ' * (-start % ALIGN)
         with open(filename, 'wb') as file:
-            pickle.dump(self, file)
+            file.write(MAGIC)
+            file.write(np.uint32(len(header)).astype('<u4').tobytes())
+            file.write(header)
+            for array in arrays:
+                file.write(np.ascontiguousarray(array, dtype=dtype).data)
 
     @staticmethod
     def load(filename):
         """
-        Loads a pickled DeepNeuralNetwork object
-        Returns the loaded pickle, or None if filename doesn’t exist
+        Loads a DeepNeuralNetwork saved by save, or an older pickled one
+        The weights are memory-mapped copy-on-write, so loading is
+            zero-copy and the file is never modified by further training
+        Returns the loaded network, or None if filename doesn’t exist
         """
         try:
             with open(filename, 'rb') as file:
-                return pickle.load(file)
+                if file.read(len(MAGIC)) != MAGIC:
+                    file.seek(0)
+                    return pickle.load(file)
+                size = int(np.frombuffer(file.read(4), dtype='<u4')[0])
+                header = json.loads(file.read(size).decode('utf-8'))
         except FileNotFoundError:
             return None
+        if header['version'] > FORMAT_VERSION:
+            raise ValueError("unsupported model file version {}".format(
+                header['version']))
+
+        dtype = np.dtype(header['dtype'])
+        sizes = [header['nx']] + header['layers']
+        count = sum(n * (prev + 1) for prev, n in zip(sizes, sizes[1:]))
+        flat = np.memmap(filename, dtype=dtype, mode='c',
+                         offset=len(MAGIC) + 4 + size, shape=(count,))
+
+        weights = {}
+        start = 0
+        for layer in range(1, len(header['layers']) + 1):
+            prev, nodes = sizes[layer - 1], sizes[layer]
+            W = flat[start:start + nodes * prev].reshape(nodes, prev)
+            start += nodes * prev
+            b = flat[start:start + nodes].reshape(nodes, 1)
+            start += nodes
+            weights['W{}'.format(layer)] = W
+            weights['b{}'.format(layer)] = b
+        return DeepNeuralNetwork.from_weights(weights, header['activation'])
+
+    @classmethod
+    def from_weights(cls, weights, activation='sig'):
+        """
+        Builds a network around existing weight arrays, without the
+            random initialization of __init__
+        weights: dictionary of the arrays W{l} and b{l} of every layer,
+            used as they are (not copied)
+        activation: 'sig' or 'tanh', as in __init__
+        Returns the network
+        """
+        network = cls.__new__(cls)
+        network.__L = len(weights) // 2
+        network.__cache = {}
+        network.__weights = dict(weights)
+        network.__activation = activation
+        network.__buffers = {}
+        return network
 
     @staticmethod
     def sigmoid(Z):
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import time
+import tracemalloc
+import numpy as np
+
+Deep27 = __import__('27-deep_neural_network').DeepNeuralNetwork
+Deep28 = __import__('28-deep_neural_network').DeepNeuralNetwork
+
+
+def profile(deep, X, Y, iterations):
+    """wall time and peak traced memory of one train call"""
+    deep.train(X, Y, iterations=1, verbose=False, graph=False)
+    tracemalloc.start()
+    start = time.perf_counter()
+    deep.train(X, Y, iterations=iterations, verbose=False, graph=False)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    m = 2048
+    X = np.random.rand(784, m)
+    Y = np.eye(10)[:, np.random.randint(0, 10, m)]
+    iterations = 200
+
+    np.random.seed(1)
+    deep27 = Deep27(784, [128, 64, 10])
+    np.random.seed(1)
+    deep28 = Deep28(784, [128, 64, 10], activation='sig')
+
+    t27, peak27 = profile(deep27, X, Y, iterations)
+    t28, peak28 = profile(deep28, X, Y, iterations)
+    print("{} iterations, X {}, layers [128, 64, 10]".format(
+        iterations, X.shape))
+    print("\tdict cache + temporaries: {:.3f}s, peak {:.1f} MB".format(
+        t27, peak27 / 2 ** 20))
+    print("\tpreallocated buffers:     {:.3f}s, peak {:.1f} MB".format(
+        t28, peak28 / 2 ** 20))
+    print("\tspeedup: {:.2f}x".format(t27 / t28))
+    print("\tsame weights:", all(np.allclose(deep27.weights[k],
+                                             deep28.weights[k])
+                                 for k in deep27.weights))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import os
+# one BLAS thread per process, so the scaling measured is the workers'
+for variable in ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(variable, '1')
+
+import time  # noqa: E402
+import numpy as np  # noqa: E402
+
+Deep28 = __import__('28-deep_neural_network').DeepNeuralNetwork
+
+
+def timed_train(X, Y, iterations, batch_size, workers):
+    """wall time of training a fresh network, and its weights"""
+    np.random.seed(1)
+    deep = Deep28(X.shape[0], [256, 128, 10], activation='tanh')
+    start = time.perf_counter()
+    deep.train(X, Y, iterations=iterations, verbose=False, graph=False,
+               batch_size=batch_size, workers=workers)
+    return time.perf_counter() - start, deep.weights
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    m = 8192
+    X = np.random.rand(784, m)
+    Y = np.eye(10)[:, np.random.randint(0, 10, m)]
+    iterations, batch_size = 10, 2048
+
+    print("{} iterations, X {}, batches of {}, layers [256, 128, 10]".format(
+        iterations, X.shape, batch_size))
+    print("{} CPUs available".format(os.cpu_count()))
+    serial, expected = timed_train(X, Y, iterations, batch_size, None)
+    print("\t{:>9}: {:.3f}s".format('serial', serial))
+    for workers in [1, 2, 4, 8]:
+        elapsed, weights = timed_train(X, Y, iterations, batch_size, workers)
+        same = all(np.allclose(weights[k], expected[k]) for k in expected)
+        print("\t{:>9}: {:.3f}s, speedup {:.2f}x, same weights: {}".format(
+            '{} worker{}'.format(workers, 's' if workers > 1 else ''),
+            elapsed, serial / elapsed, same))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import sys
+import numpy as np
+
+Neuron = __import__('7-neuron').Neuron
+NN = __import__('15-neural_network').NeuralNetwork
+Deep28 = __import__('28-deep_neural_network').DeepNeuralNetwork
+one_hot_encode = __import__('24-one_hot_encode').one_hot_encode
+one_hot_decode = __import__('25-one_hot_decode').one_hot_decode
+
+# largest accuracy change, in percentage points, float32 training may cause
+TOLERANCE = 0.5
+# standard deviation of the pixel noise of the synthetic images
+NOISE = 0.5
+
+
+def synthetic(prototypes, m, noise):
+    """
+    (pixels, m) noisy copies of randomly chosen prototypes, clipped to
+    the [0, 1] pixel range, and the index of the prototype of each
+    """
+    labels = np.random.randint(0, prototypes.shape[0], m)
+    X = prototypes[labels] + np.random.normal(0, noise, (m,) +
+                                              prototypes.shape[1:])
+    return np.clip(X, 0, 1).T, labels
+
+
+def binary_accuracy(model, X, Y):
+    """accuracy in percent of a binary classifier"""
+    A = model.evaluate(X, Y)[0]
+    return np.sum(A == Y) / Y.shape[1] * 100
+
+
+def deep_accuracy(model, X, Y):
+    """accuracy in percent of a softmax classifier, Y holds class labels"""
+    A = one_hot_decode(model.evaluate(X, one_hot_encode(Y, 10))[0])
+    return np.sum(A == Y) / Y.shape[0] * 100
+
+
+def compare(name, build, train, accuracy, data):
+    """
+    trains the same model from the same seed in float64 and float32
+    and prints the accuracy of both on every data set
+    Returns whether no accuracy moved by more than TOLERANCE
+    """
+    results = {}
+    for dtype in (np.float64, np.float32):
+        np.random.seed(0)
+        model = build(dtype)
+        train(model)
+        results[dtype] = [accuracy(model, X, Y) for X, Y in data.values()]
+    ok = True
+    print(name)
+    for i, label in enumerate(data):
+        a64, a32 = results[np.float64][i], results[np.float32][i]
+        ok = ok and abs(a64 - a32) <= TOLERANCE
+        print("\t{:<10} float64 {:.2f}%  float32 {:.2f}%".format(
+            label, a64, a32))
+    return ok
+
+
+if __name__ == '__main__':
+    # synthetic stand-ins for the MNIST and binary data sets: 10 classes
+    # of 14x14 images, each a random prototype image plus noise, the
+    # binary task telling class 0 from the rest
+    np.random.seed(0)
+    prototypes = np.random.rand(10, 14 * 14)
+    mnist = {}
+    for label, m in [('train', 2000), ('valid', 500), ('test', 500)]:
+        mnist[label] = synthetic(prototypes, m, NOISE)
+    binary = {label: (X, (Y == 0).astype(int).reshape(1, -1))
+              for label, (X, Y) in list(mnist.items())[:2]}
+    X_train, Y_train = binary['train']
+    X_mnist = mnist['train'][0]
+    Y_mnist = one_hot_encode(mnist['train'][1], 10)
+
+    ok = compare('7-neuron',
+                 lambda dtype: Neuron(X_train.shape[0], dtype=dtype),
+                 lambda model: model.train(X_train, Y_train, iterations=3000,
+                                           verbose=False, graph=False),
+                 binary_accuracy, binary)
+    ok = compare('15-neural_network',
+                 lambda dtype: NN(X_train.shape[0], 3, dtype=dtype),
+                 lambda model: model.train(X_train, Y_train,
+                                           verbose=False, graph=False),
+                 binary_accuracy, binary) and ok
+    ok = compare('28-deep_neural_network',
+                 lambda dtype: Deep28(X_mnist.shape[0], [128, 64, 10],
+                                      activation='tanh', dtype=dtype),
+                 lambda model: model.train(X_mnist, Y_mnist, iterations=100,
+                                           verbose=False, graph=False),
+                 deep_accuracy, mnist) and ok
+    print("accuracy unchanged" if ok else
+          "accuracy changed by more than {} points".format(TOLERANCE))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+Deep28 = __import__('28-deep_neural_network').DeepNeuralNetwork
+EarlyStopping = __import__('early_stopping').EarlyStopping
+
+
+def noisy_classes(prototypes, m, noise):
+    """m noisy copies of random prototypes, as (nx, m) X and one-hot Y"""
+    labels = np.random.randint(0, prototypes.shape[0], m)
+    X = prototypes[labels] + np.random.normal(0, noise, (m,) +
+                                              prototypes.shape[1:])
+    return X.T, np.eye(prototypes.shape[0])[:, labels]
+
+
+if __name__ == '__main__':
+    # a small, noisy training set the network overfits
+    np.random.seed(0)
+    prototypes = np.random.rand(10, 100)
+    X_train, Y_train = noisy_classes(prototypes, 200, 1.0)
+    X_valid, Y_valid = noisy_classes(prototypes, 1000, 1.0)
+
+    np.random.seed(1)
+    deep = Deep28(X_train.shape[0], [256, 128, 10], activation='tanh')
+    stopper = EarlyStopping(threshold=0, patience=5, every=10)
+    deep.train(X_train, Y_train, iterations=2000, alpha=0.1, step=100,
+               graph=False, early_stopping=stopper,
+               validation=(X_valid, Y_valid))
+    print("Stopped after {} iterations".format(stopper.step))
+    print("Best validation cost {} after {} iterations".format(
+        stopper.best_cost, stopper.best_step))
+    print("Restored weights validation cost:",
+          deep.evaluate(X_valid, Y_valid)[1])
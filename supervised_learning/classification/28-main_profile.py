@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+Deep28 = __import__('28-deep_neural_network').DeepNeuralNetwork
+Profiler = __import__('profiler').Profiler
+one_hot_encode = __import__('24-one_hot_encode').one_hot_encode
+
+lib = np.load('../data/MNIST.npz')
+X_train_3D = lib['X_train']
+Y_train = lib['Y_train']
+X_train = X_train_3D.reshape((X_train_3D.shape[0], -1)).T
+Y_train_one_hot = one_hot_encode(Y_train, 10)
+
+np.random.seed(0)
+deep = Deep28(X_train.shape[0], [128, 64, 10], activation='tanh')
+with Profiler(memory=True) as profiler:
+    profiler.attach(deep)
+    deep.train(X_train, Y_train_one_hot, iterations=20, step=10,
+               graph=False, batch_size=1024)
+print(profiler.to_csv())
+profiler.to_json('28-profile.json')
@@ -2,22 +2,29 @@
 """look pa, I'm makin neurons"""
 import numpy as np
 import matplotlib.pyplot as plt
+iterate_batches = __import__('batches').iterate_batches
+mean_cost = __import__('batches').mean_cost
+evaluate_batches = __import__('batches').evaluate_batches
 
 
 class Neuron:
     """defines a single neuron performing binary classification"""
-    def __init__(self, nx):
+    def __init__(self, nx, dtype=np.float64):
         """
         W: The weights vector for the neuron
         b: The bias for the neuron
         A: The activated output of the neuron (prediction)
+        dtype: floating point type of the weights, activations and
+            gradients; inputs are cast to it, the cost is summed in float64
         """
         if not isinstance(nx, int):
             raise TypeError("nx must be an integer")
         if nx < 1:
             raise ValueError("nx must be a positive integer")
+        if not np.issubdtype(dtype, np.floating):
+            raise TypeError("dtype must be a floating point type")
 
-        self.__W = np.random.randn(1, nx)
+        self.__W = np.random.randn(1, nx).astype(dtype, copy=False)
         self.__b = 0
         self.__A = 0
 
@@ -43,6 +50,7 @@ class Neuron:
         calculate weighted sum of inputs + bias (Z = WX + b)
         utilize sigmoid activation function (sigmoid(Z) = 1 / (1 + e^-Z))
         """
+        X = X.astype(self.__W.dtype, copy=False)
         Z = np.dot(self.__W, X) + self.__b
         self.__A = 1 / (1 + np.exp(-Z))
         return self.__A
@@ -63,6 +71,7 @@ class Neuron:
         cost = -1/m * Σ [Y * log(A) + (1 - Y) * log(1 - A)]
         """
         m = Y.shape[1]
+        A = A.astype(np.float64, copy=False)
         cost = -1/m * np.sum(Y * np.log(A) + (1 - Y) * np.log(1.0000001 - A))
         return cost
 
@@ -97,14 +106,16 @@ class Neuron:
         Updates the private attributes __W and __b
         """
         m = X.shape[1]
-        dZ = A - Y
+        X = X.astype(self.__W.dtype, copy=False)
+        dZ = np.subtract(A, Y, dtype=self.__W.dtype)
         dW = np.dot(dZ, X.T) / m
         db = np.sum(dZ) / m
-        self.__W = self.__W - alpha * dW.T
+        self.__W = self.__W - alpha * dW
         self.__b = self.__b - alpha * db
 
     def train(self, X, Y, iterations=5000, alpha=0.05,
-              verbose=True, graph=True, step=100):
+              verbose=True, graph=True, step=100,
+              batch_size=None, shuffle=False):
         """
         Trains the deep neural network
             by updating the private attributes __A, __W, and __b
@@ -119,6 +130,13 @@ class Neuron:
         graph: boolean that defines if the cost
             should be plotted every step
         step: number of iterations to print or plot the cost
+        batch_size: number of examples per gradient descent step,
+            None for full-batch gradient descent
+        shuffle: whether to visit the examples in a new random order
+            every iteration
+        X may also be a stream of (X, Y) chunks with Y set to None
+            (see batches.iterate_batches); each iteration is then one
+            pass over the stream and the cost is the mean over its batches
         """
         if type(iterations) != int:
             raise TypeError('iterations must be an integer')
@@ -138,27 +156,44 @@ class Neuron:
             if step <= 0 or step > iterations:
                 raise ValueError('step must be positive and <= iterations')
 
+        if batch_size is not None:
+            if type(batch_size) != int:
+                raise TypeError('batch_size must be an integer')
+            if batch_size <= 0:
+                raise ValueError('batch_size must be positive')
+
         # Initialize costs list to keep track of cost for each step iterations
         costs = []
 
-        # Loop over iterations
+        # Loop over iterations, the last one only measures the cost
         for i in range(iterations + 1):
-            # Forward propagate to get the activation 'A'
-            A = self.forward_prop(X)
+            report = (verbose or graph) and i % step == 0
+            if i == iterations and not report:
+                break
+            batch_costs = []
+            batch_sizes = []
+
+            for X_batch, Y_batch in iterate_batches(X, Y, batch_size,
+                                                    shuffle):
+                # Forward propagate to get the activation 'A'
+                A = self.forward_prop(X_batch)
+                if report:
+                    batch_costs.append(self.cost(Y_batch, A))
+                    batch_sizes.append(Y_batch.shape[1])
+
+                # If not the last iteration,
+                # perform gradient descent to update weights and biases
+                if i != iterations:
+                    self.gradient_descent(X_batch, Y_batch, A, alpha)
 
             # If verbose, print the cost every step iterations
-            if verbose and i % step == 0:
-                print("Cost after {} iterations: {}".
-                      format(i, self.cost(Y, A)))
-
-            # If not the last iteration,
-            # perform gradient descent to update weights and biases
-            if i != iterations:
-                self.gradient_descent(X, Y, A, alpha)
-
             # If graph, append the cost to costs list every step iterations
-            if graph and i % step == 0:
-                costs.append(self.cost(Y, self.A))
+            if report:
+                cost = mean_cost(batch_costs, batch_sizes)
+                if verbose:
+                    print("Cost after {} iterations: {}".format(i, cost))
+                if graph:
+                    costs.append(cost)
 
         # Plot the cost over iterations if graph is True
         if graph:
@@ -169,4 +204,4 @@ class Neuron:
             plt.show()
 
         # Return the evaluation of the training data
-        return self.evaluate(X, Y)
+        return evaluate_batches(self.evaluate, X, Y, batch_size)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""mini-batch and streaming iteration over (X, Y) training data"""
+import numpy as np
+
+
+def iterate_batches(X, Y=None, batch_size=None, shuffle=False):
+    """
+    Yields the (X, Y) mini-batches of one epoch
+    X: numpy.ndarray (or np.memmap) with shape (nx, m)
+            that contains the input data, with Y its labels
+        or, when Y is None, a stream of (X, Y) chunks:
+            an iterable that is iterated again every epoch,
+            or a function (such as a generator function) returning one
+    Y: numpy.ndarray with shape (classes, m) of labels, or None for streams
+    batch_size: number of examples per batch,
+        None to use each array or chunk whole
+    shuffle: whether to visit the examples (of each chunk) in a new
+        random order every epoch; the indices of a batch are sorted so
+        memory-mapped data is read in file order
+    """
+    if Y is None:
+        chunks = X() if callable(X) else X
+    else:
+        chunks = ((X, Y),)
+
+    empty = True
+    for X_chunk, Y_chunk in chunks:
+        empty = False
+        m = X_chunk.shape[1]
+        if batch_size is None and not shuffle:
+            yield X_chunk, Y_chunk
+            continue
+        size = batch_size or m
+        order = np.random.permutation(m) if shuffle else None
+        for start in range(0, m, size):
+            if order is None:
+                yield (X_chunk[:, start:start + size],
+                       Y_chunk[:, start:start + size])
+            else:
+                batch = np.sort(order[start:start + size])
+                yield (np.take(X_chunk, batch, axis=1),
+                       np.take(Y_chunk, batch, axis=1))
+    if empty:
+        raise ValueError("X yielded no data, pass an iterable that can be "
+                         "iterated every epoch or a function returning one")
+
+
+def mean_cost(costs, sizes):
+    """
+    Combines per-batch costs into the cost of the whole epoch
+    costs: list of the mean cost of each batch
+    sizes: list of the number of examples in each batch
+    Returns the mean cost weighted by batch size
+    """
+    if len(costs) == 1:
+        return costs[0]
+    return np.dot(costs, sizes) / np.sum(sizes)
+
+
+def evaluate_batches(evaluate, X, Y=None, batch_size=None):
+    """
+    Evaluates a model over all the batches of X and Y
+    evaluate: the model's evaluate method
+    X, Y, batch_size: same as for iterate_batches
+    Returns the predictions of every batch concatenated along the
+        examples axis, and the cost of the whole data set
+    """
+    if Y is not None and batch_size is None:
+        return evaluate(X, Y)
+    predictions, costs, sizes = [], [], []
+    for X_batch, Y_batch in iterate_batches(X, Y, batch_size):
+        prediction, cost = evaluate(X_batch, Y_batch)
+        predictions.append(prediction)
+        costs.append(cost)
+        sizes.append(Y_batch.shape[1])
+    return np.concatenate(predictions, axis=1), mean_cost(costs, sizes)
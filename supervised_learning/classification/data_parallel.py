@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""data-parallel gradient descent over a pool of worker processes"""
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# per-process state of a pool worker, filled in by _attach
+_worker = {}
+
+
+def _shared(shape, dtype, name=None):
+    """
+    Creates (or, given its name, attaches to) a block of shared memory
+    Returns the SharedMemory and a numpy.ndarray of shape and dtype on it
+    """
+    size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    if name is None:
+        memory = SharedMemory(create=True, size=size)
+    else:
+        memory = SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _views(flat, shapes):
+    """Splits a flat array into consecutive arrays of the given shapes"""
+    views, start = [], 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        views.append(flat[start:start + size].reshape(shape))
+        start += size
+    return views
+
+
+def _attach(cls, activation, dtype, shapes, names, workers):
+    """
+    Pool initializer: builds the worker's own network of class cls whose
+        weights are views of the shared weights, and attaches to the
+        shared gradient rows
+    """
+    count = sum(int(np.prod(shape)) for shape in shapes)
+    weights_memory, flat = _shared((count,), dtype, names[0])
+    grads_memory, grads = _shared((workers, count), dtype, names[1])
+    views = _views(flat, shapes)
+    weights = {}
+    for layer in range(1, len(shapes) // 2 + 1):
+        weights['W{}'.format(layer)] = views[2 * layer - 2]
+        weights['b{}'.format(layer)] = views[2 * layer - 1]
+    network = cls.from_weights(weights, activation)
+    _worker.update(network=network, dtype=dtype, shapes=shapes, grads=grads,
+                   memory=[weights_memory, grads_memory], data=None,
+                   data_memory=[])
+
+
+def _shard(job):
+    """
+    Computes the gradients of one shard [start, stop) of the shared batch
+        into row k of the shared gradients, scaled by the shard's share
+        of the batch so the rows only have to be summed
+    Returns the shard's share of the batch cost
+    """
+    k, start, stop, m, names, shapes = job
+    if _worker['data'] != names:
+        # the batch buffers were reallocated: drop every view of the old
+        # ones (the network's cache holds one of X) before closing them
+        _worker.update(X=None, Y=None)
+        _worker['network'].cache.clear()
+        for memory in _worker['data_memory']:
+            memory.close()
+        X_memory, X = _shared(shapes[0], _worker['dtype'], names[0])
+        Y_memory, Y = _shared(shapes[1], _worker['dtype'], names[1])
+        _worker.update(data=names, X=X, Y=Y, data_memory=[X_memory, Y_memory])
+    network = _worker['network']
+    cost = network.gradients(_worker['X'][:, start:stop],
+                             _worker['Y'][:, start:stop])
+    buffers = network.buffers(stop - start)
+    share = (stop - start) / m
+    row = _views(_worker['grads'][k], _worker['shapes'])
+    for layer in range(1, network.L + 1):
+        np.multiply(buffers['dW'][layer], share, out=row[2 * layer - 2])
+        np.multiply(buffers['db'][layer], share, out=row[2 * layer - 1])
+    return cost * share
+
+
+class DataParallel:
+    """
+    Data-parallel gradient descent for a DeepNeuralNetwork
+
+    The weights live in one flat block of shared memory that every worker
+        process maps, so they are never sent to the workers. Each batch is
+        copied once into shared memory and split into one contiguous shard
+        per worker; every worker computes its shard's gradients into its
+        own row of a shared (workers, parameters) array, and the rows are
+        summed (the all-reduce) before a single in-place update
+    """
+    def __init__(self, network, workers):
+        """
+        network: the DeepNeuralNetwork to train; its weights are copied
+            into shared memory and copied back by close
+        workers: the number of worker processes
+        """
+        if not isinstance(workers, int):
+            raise TypeError("workers must be an integer")
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        self.__network = network
+        self.__workers = workers
+        self.__keys = []
+        for layer in range(1, network.L + 1):
+            self.__keys += ['W{}'.format(layer), 'b{}'.format(layer)]
+        arrays = [network.weights[key] for key in self.__keys]
+        self.__dtype = np.result_type(*arrays)
+        self.__shapes = [array.shape for array in arrays]
+        count = sum(array.size for array in arrays)
+
+        weights_memory, self.__flat = _shared((count,), self.__dtype)
+        grads_memory, self.__grads = _shared((workers, count), self.__dtype)
+        self.__memory = [weights_memory, grads_memory]
+        self.__total = np.empty(count, dtype=self.__dtype)
+        for view, array in zip(_views(self.__flat, self.__shapes), arrays):
+            view[...] = array
+        self.__data = None
+        self.__data_memory = []
+        self.__pool = Pool(workers, initializer=_attach, initargs=(
+            type(network), network.activation, self.__dtype, self.__shapes,
+            [memory.name for memory in self.__memory], workers))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __reserve(self, X, Y):
+        """
+        Copies a batch into the shared input buffers, which are replaced
+            by larger ones when the batch does not fit
+        """
+        nx, m = X.shape
+        if self.__data is None or self.__data[0].shape[1] < m:
+            self.__release_data()
+            X_memory, X_shared = _shared((nx, m), self.__dtype)
+            Y_memory, Y_shared = _shared((Y.shape[0], m), self.__dtype)
+            self.__data = (X_shared, Y_shared)
+            self.__data_memory = [X_memory, Y_memory]
+        self.__data[0][:, :m] = X
+        self.__data[1][:, :m] = Y
+
+    def step(self, X, Y, alpha):
+        """
+        One data-parallel gradient descent step over a batch
+        X: a numpy.ndarray with shape (nx, m) that contains the input data
+        Y: a numpy.ndarray with shape (classes, m) of one-hot labels
+        alpha: the learning rate
+        Returns the cost of the batch before the update
+        """
+        m = X.shape[1]
+        self.__reserve(X, Y)
+        names = tuple(memory.name for memory in self.__data_memory)
+        shapes = (self.__data[0].shape, self.__data[1].shape)
+        bounds = np.linspace(0, m, min(self.__workers, m) + 1).astype(int)
+        jobs = [(k, start, stop, m, names, shapes)
+                for k, (start, stop) in enumerate(zip(bounds, bounds[1:]))]
+        cost = sum(self.__pool.map(_shard, jobs, chunksize=1))
+        np.sum(self.__grads[:len(jobs)], axis=0, out=self.__total)
+        self.__total *= alpha
+        self.__flat -= self.__total
+        return cost
+
+    def __release_data(self):
+        """Frees the shared input buffers"""
+        self.__data = None
+        for memory in self.__data_memory:
+            memory.close()
+            memory.unlink()
+        self.__data_memory = []
+
+    def sync(self):
+        """Copies the shared weights into the network's own arrays"""
+        views = _views(self.__flat, self.__shapes)
+        for key, view in zip(self.__keys, views):
+            np.copyto(self.__network.weights[key], view)
+
+    def close(self):
+        """
+        Stops the workers, copies the trained weights back into the
+            network's own arrays and frees the shared memory
+        """
+        if self.__pool is None:
+            return
+        self.__pool.terminate()
+        self.__pool.join()
+        self.__pool = None
+        self.sync()
+        self.__flat = self.__grads = None
+        self.__release_data()
+        for memory in self.__memory:
+            memory.close()
+            memory.unlink()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""numerically stable softmax output layer and its cross-entropy cost"""
+import numpy as np
+
+
+def softmax(Z, out=None):
+    """
+    Softmax activation of each column of Z
+    Z: numpy.ndarray with shape (classes, m) of pre-activations
+    out: optional array of the same shape the result is written into,
+        may be Z itself
+    The column maximum is subtracted before exponentiating, so large
+        logits cannot overflow; the result keeps Z's dtype (float32 stays
+        float32)
+    Returns the activations, shape (classes, m)
+    """
+    out = np.subtract(Z, np.max(Z, axis=0, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= np.sum(out, axis=0, keepdims=True)
+    return out
+
+
+def cross_entropy(Y, A):
+    """
+    Cross-entropy cost of softmax activations
+    Y: numpy.ndarray with shape (classes, m) of one-hot labels
+    A: numpy.ndarray with shape (classes, m) of softmax activations
+    Activations that underflowed to 0 are clipped to the smallest
+        positive value of their dtype instead of giving log(0)
+    Returns the mean cost over the m examples as a float
+    """
+    m = Y.shape[1]
+    tiny = np.finfo(A.dtype).tiny
+    log_A = np.log(np.maximum(A, tiny))
+    return -1 / m * np.sum(Y * log_A, dtype=np.float64)
+
+
+def softmax_cross_entropy(Z, Y, A=None, dZ=None):
+    """
+    Softmax activation, cross-entropy cost and output gradient together
+    Z: numpy.ndarray with shape (classes, m) of pre-activations
+    Y: numpy.ndarray with shape (classes, m) of one-hot labels
+    A: optional array the activations are written into, may be Z itself
+    dZ: optional array the gradient of the cost with respect to Z
+        (times m) is written into
+    The cost is taken from the log-softmax
+        log(A) = Z - max - log(sum(exp(Z - max)))
+        so it is computed while the activations are built, never takes
+        the log of an activation and stays finite for any logits;
+        sums over examples are accumulated in float64
+    Returns A, the mean cost as a float, and dZ = A - Y
+    """
+    m = Y.shape[1]
+    A = np.subtract(Z, np.max(Z, axis=0, keepdims=True), out=A)
+    # sum of Y * (Z - max) per example, before A is exponentiated
+    label_logit = np.einsum('ij,ij->j', Y, A)
+    np.exp(A, out=A)
+    total = np.sum(A, axis=0, keepdims=True)
+    A /= total
+    log_total = np.log(total[0], dtype=np.float64)
+    cost = -1 / m * (np.sum(label_logit, dtype=np.float64) -
+                     np.dot(np.sum(Y, axis=0, dtype=np.float64), log_total))
+    if dZ is None:
+        dZ = np.empty_like(A)
+    np.subtract(A, Y, out=dZ)
+    return A, cost, dZ
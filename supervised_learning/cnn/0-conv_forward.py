@@ -2,9 +2,12 @@
 """performs forward propagation over
 a convolutional layer of a neural network"""
 import numpy as np
+pad = __import__('im2col').pad
+im2col = __import__('im2col').im2col
 
 
-def conv_forward(A_prev, W, b, activation, padding="same", stride=(1, 1)):
+def conv_forward(A_prev, W, b, activation, padding="same", stride=(1, 1),
+                 dtype=np.float64):
     """
     perform forward propagation over a convolutional layer of a neural network
 
@@ -28,6 +31,8 @@ def conv_forward(A_prev, W, b, activation, padding="same", stride=(1, 1)):
     stride: a tuple of (sh, sw) containing the strides for the convolution
         sh: stride for the height
         sw: stride for the width
+    dtype: the dtype the convolution is computed in
+        ...np.float32 halves the memory traffic of the im2col matrix
     Returns: the output of the convolutional layer
     """
     # retrieve dimensions from A_prev's shape
@@ -104,70 +109,29 @@ def conv_forward(A_prev, W, b, activation, padding="same", stride=(1, 1)):
     output_height = (h_prev + 2 * ph - kh) // sh + 1
     output_width = (w_prev + 2 * pw - kw) // sw + 1
 
-    # Initialize the output volume Z with zeros
-    Z = np.zeros((m, output_height, output_width, c_new))
-
     # Create A_prev_pad by padding A_prev
-    A_prev_pad = np.pad(
-        A_prev, ((0, 0), (ph, ph), (pw, pw), (0, 0)), 'constant')
+    A_prev_pad = pad(A_prev, (ph, pw), dtype)
 
     """
-    Performs Convolution Operation / Filter Application / Kernel Loop
-    Loop over the vertical (height), then horizontal (width),
-        then over channels (c)
-    This is done to apply the filter to every possible position in the input
-    volume for each channel.
-
-    'for h in range(output_height):'
-    iterates over the height of the output volume. For each position,
-    the filter is applied to the corresponding position in the input volume.
-
-    'for w in range(output_width):'
-    iterates over the width of the output volume.
-    Combined with the outer loop,
-        this allows us to cover every position in 2D space of the input volume
-
-    'for c in range(c_new):':
-    iterates over the channels of the output volume. For each channel,
-    a different set of filters is applied.
+    Performs Convolution Operation as a single matrix multiplication
+
+    'im2col(A_prev_pad, (kh, kw), stride)':
+    gathers every window the filter is applied to through a strided view
+        and flattens each one into a row, giving a matrix of shape
+        (m * output_height * output_width, kh * kw * c_prev)
+
+    'W.reshape(kh * kw * c_prev, c_new)':
+    flattens every filter into a column in the same order,
+        so one matmul applies every filter to every window at once
+        ...instead of looping over height, width and channels
+
+    the (1, c_new) biases broadcast over every row of the product
     """
-    # loop over the vertical (h), then horizontal (w), then over channels (c)
-    for h in range(output_height):
-        for w in range(output_width):
-            for c in range(c_new):
-                # calculate the starting position of the filter on the input
-                #   for the current step of the convolution
-                # starting position determined by current step of convolution
-                # (h or w) multiplied by the stride (sh or sw)
-                filter_start_height = h * sh
-                filter_start_width = w * sw
-                # calculate the ending position of the filter on the input
-                #   for current step of the convolution
-                # the ending position is determined by the starting pos
-                #   + the size of the filter (kh or kw)
-                filter_end_height = filter_start_height + kh
-                filter_end_width = filter_start_width + kw
-
-                # Extract a slice from the padded input volume.
-                # The slice is the portion of the input volume that the filter
-                #   will be applied to in the current step.
-                # Use the corners to define the slice from A_prev_pad
-                a_slice_prev = A_prev_pad[
-                    :,
-                    filter_start_height:filter_end_height,
-                    filter_start_width:filter_end_width,
-                    :]
-
-                # Extract the filters and biases for the current channel.
-                weights = W[:, :, :, c]
-                biases = b[0, 0, 0, c]
-
-                # Apply the filter to the slice of the input volume,
-                #   sums up the resultsx and adds the bias.
-                # The result is a single value that is the output of
-                #   the convolution for the current position and channel.
-                Z[:, h, w, c] = np.sum(
-                    a_slice_prev * weights, axis=(1, 2, 3)) + biases
+    cols, _ = im2col(A_prev_pad, (kh, kw), stride)
+    weights = W.reshape(kh * kw * c_prev, c_new).astype(dtype, copy=False)
+    Z = np.matmul(cols, weights)
+    Z += b.reshape(1, c_new).astype(dtype, copy=False)
+    Z = Z.reshape(m, output_height, output_width, c_new)
 
     # Apply the activation function
     A = activation(Z)
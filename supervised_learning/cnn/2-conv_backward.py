@@ -4,9 +4,13 @@ performs back propagation
 over a convolutional layer of a neural network
 """
 import numpy as np
+pad = __import__('im2col').pad
+im2col = __import__('im2col').im2col
+col2im = __import__('im2col').col2im
 
 
-def conv_backward(dZ, A_prev, W, b, padding="same", stride=(1, 1)):
+def conv_backward(dZ, A_prev, W, b, padding="same", stride=(1, 1),
+                  dtype=np.float64):
     """
     dZ is a numpy.ndarray of shape (m, h_new, w_new, c_new)
         ...containing the partial derivatives with respect
@@ -32,6 +36,8 @@ def conv_backward(dZ, A_prev, W, b, padding="same", stride=(1, 1)):
         ...containing the strides for the convolution
         sh: the stride for the height
         sw: the stride for the width
+    dtype: the dtype the gradients are computed in
+        ...np.float32 halves the memory traffic of the im2col matrices
     Returns: the partial derivatives with respect
         to the previous layer (dA_prev), the kernels (dW),
         and the biases (db), respectively
@@ -51,9 +57,6 @@ def conv_backward(dZ, A_prev, W, b, padding="same", stride=(1, 1)):
     sh = stride[0]
     sw = stride[1]
 
-    # Initialize dA_prev, dW, db with the correct shapes
-    dA_prev = np.zeros_like(A_prev)
-    dW = np.zeros_like(W)
     db = np.sum(dZ, axis=(0, 1, 2), keepdims=True)
 
     # Compute padding dimensions based on the padding type
@@ -63,31 +66,26 @@ def conv_backward(dZ, A_prev, W, b, padding="same", stride=(1, 1)):
         pad_h = (((h_prev - 1) * sh) + kh - h_prev) // 2 + 1
         pad_w = (((w_prev - 1) * sw) + kw - w_prev) // 2 + 1
 
-    # Pad A_prev and dA_prev
-    A_prev = np.pad(A_prev, ((0, 0), (pad_h, pad_h), (pad_w, pad_w), (0, 0)),
-                    mode='constant', constant_values=0)
-    dA = np.pad(dA_prev, ((0, 0), (pad_h, pad_h), (pad_w, pad_w), (0, 0)),
-                mode='constant', constant_values=0)
+    # Pad A_prev and unroll the windows dZ covers into the im2col matrix
+    A_prev_pad = pad(A_prev, (pad_h, pad_w), dtype)
+    h_used = (h_new - 1) * sh + kh
+    w_used = (w_new - 1) * sw + kw
+    cols, _ = im2col(A_prev_pad[:, :h_used, :w_used], (kh, kw), stride)
 
-    # Loop over the vertical (h), then horizontal (w), then over channels (c)
-    for image in range(m):
-        for h in range(h_new):
-            for w in range(w_new):
-                for c in range(c_new):
-                    # Find the corners of the current slice
-                    start_h = h * sh
-                    start_w = w * sw
-                    end_h = start_h + kh
-                    end_w = start_w + kw
+    # Every window/filter pair becomes one entry of two matmuls:
+    #   dW = cols.T @ dZ sums a_slice * dZ over every example and position
+    #   dcols = dZ @ W.T is the kernel * dZ added back onto each window
+    dZ_mat = dZ.reshape(m * h_new * w_new, c_new).astype(dtype, copy=False)
+    W_mat = W.reshape(kh * kw * c_prev, c_new).astype(dtype, copy=False)
+    dW = np.matmul(cols.T, dZ_mat).reshape(W.shape)
+    dcols = np.matmul(dZ_mat, W_mat.T)
 
-                    # Slice A_prev_pad and W
-                    a_slice = A_prev[image, start_h:end_h, start_w:end_w, :]
-                    kernel = W[:, :, :, c]
-
-                    # Update gradients for the window and the filter's params
-                    dW[:, :, :, c] += a_slice * dZ[image, h, w, c]
-                    dA[image, start_h:end_h, start_w:end_w, :] += kernel * dZ[
-                        image, h, w, c]
+    # Fold the window gradients back onto the padded input (col2im)
+    dA = col2im(dcols, (m, h_used, w_used, c_prev), (kh, kw), stride)
+    if dA.shape != A_prev_pad.shape:
+        dA_full = np.zeros(A_prev_pad.shape, dtype=dA.dtype)
+        dA_full[:, :h_used, :w_used] = dA
+        dA = dA_full
 
     # Unpad dA to avoid excess
     if padding == 'same':
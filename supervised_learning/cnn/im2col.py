@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""strided window helpers shared by the convolution and pooling layers"""
+import numpy as np
+
+
+def window_view(A, kernel_shape, stride=(1, 1)):
+    """
+    builds a strided view of every kernel window of A without copying
+
+    A is a numpy.ndarray of shape (m, h, w, c)
+        ...already padded if the layer uses padding
+    kernel_shape is a tuple of (kh, kw)
+    stride is a tuple of (sh, sw)
+    Returns: a read-only view of shape (m, h_out, w_out, kh, kw, c)
+        ...where view[i, y, x] is the window under the kernel
+        ...at output position (y, x) of example i
+    """
+    m, h, w, c = A.shape
+    kh, kw = kernel_shape
+    sh, sw = stride
+
+    h_out = (h - kh) // sh + 1
+    w_out = (w - kw) // sw + 1
+    sm, sy, sx, sc = A.strides
+
+    return np.lib.stride_tricks.as_strided(
+        A,
+        shape=(m, h_out, w_out, kh, kw, c),
+        strides=(sm, sy * sh, sx * sw, sy, sx, sc),
+        writeable=False)
+
+
+def pad(A, padding, dtype=None):
+    """
+    zero pads the height and width of A, casting it to dtype first
+
+    A is a numpy.ndarray of shape (m, h, w, c)
+    padding is a tuple of (ph, pw)
+    dtype: the dtype of the padded copy, A.dtype if None
+    Returns: the padded numpy.ndarray
+    """
+    ph, pw = padding
+    if dtype is not None:
+        A = A.astype(dtype, copy=False)
+    if ph == 0 and pw == 0:
+        return A
+    return np.pad(A, ((0, 0), (ph, ph), (pw, pw), (0, 0)), 'constant')
+
+
+def im2col(A, kernel_shape, stride=(1, 1)):
+    """
+    flattens every kernel window of A into one row of a matrix
+
+    A is a numpy.ndarray of shape (m, h, w, c), already padded
+    kernel_shape is a tuple of (kh, kw)
+    stride is a tuple of (sh, sw)
+    Returns: cols, (m, h_out, w_out)
+        cols is a numpy.ndarray of shape (m * h_out * w_out, kh * kw * c)
+        ...ordered so that cols @ W.reshape(kh * kw * c, c_new) is the
+        ...convolution of A with the kernels W
+    """
+    windows = window_view(A, kernel_shape, stride)
+    m, h_out, w_out, kh, kw, c = windows.shape
+    return windows.reshape(m * h_out * w_out, kh * kw * c), (m, h_out, w_out)
+
+
+def col2im(cols, shape, kernel_shape, stride=(1, 1), dtype=None):
+    """
+    inverse of im2col: sums every window row back onto an array
+
+    cols is a numpy.ndarray of shape (m, h_out, w_out, kh, kw, c)
+        ...or (m * h_out * w_out, kh * kw * c)
+    shape is the (m, h, w, c) shape of the array im2col was built from
+    kernel_shape is a tuple of (kh, kw)
+    stride is a tuple of (sh, sw)
+    dtype: the dtype of the result, cols.dtype if None
+
+    when the stride equals the kernel the windows tile the array, so the
+        ...fold is a reshape; otherwise each of the kh * kw kernel offsets
+        ...is added as one strided slice
+    Returns: a numpy.ndarray of the given shape
+    """
+    m, h, w, c = shape
+    kh, kw = kernel_shape
+    sh, sw = stride
+    h_out = (h - kh) // sh + 1
+    w_out = (w - kw) // sw + 1
+    cols = cols.reshape(m, h_out, w_out, kh, kw, c)
+    if dtype is None:
+        dtype = cols.dtype
+    A = np.zeros(shape, dtype=dtype)
+
+    if (sh, sw) == (kh, kw):
+        A[:, :h_out * kh, :w_out * kw] = cols.transpose(
+            0, 1, 3, 2, 4, 5).reshape(m, h_out * kh, w_out * kw, c)
+        return A
+
+    for i in range(kh):
+        for j in range(kw):
+            A[:, i:i + sh * h_out:sh, j:j + sw * w_out:sw] += cols[
+                :, :, :, i, j]
+    return A
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""vectorized max/average pooling with a cached backward pass"""
+import numpy as np
+window_view = __import__('im2col').window_view
+col2im = __import__('im2col').col2im
+
+
+def pool(A_prev, kernel_shape, stride=(1, 1), mode='max'):
+    """
+    pools every window of A_prev in a single reduction
+
+    A_prev is a numpy.ndarray of shape (m, h_prev, w_prev, c_prev)
+    kernel_shape is a tuple of (kh, kw)
+    stride is a tuple of (sh, sw)
+    mode: string containing either max or avg
+    Returns: a numpy.ndarray of shape (m, h_new, w_new, c_prev)
+    """
+    windows = window_view(A_prev, kernel_shape, stride)
+    if mode == 'max':
+        A = windows.max(axis=(3, 4))
+    else:
+        A = windows.mean(axis=(3, 4))
+    return A.astype(out_dtype(A_prev), copy=False)
+
+
+def pool_cache(A_prev, kernel_shape, stride=(1, 1), mode='max', ties=False):
+    """
+    pools A_prev and keeps what pool_grad needs to route the gradient
+
+    A_prev, kernel_shape, stride and mode are the same as for pool
+    ties: if True, max pooling hands the gradient to every element
+        ...equal to the window max instead of only the first argmax
+    Returns: A, cache
+        A is the output of the pooling layer
+        cache is a dict holding the layer geometry and, for max pooling,
+        ...either the flat argmax of each window or the tie mask
+    """
+    kh, kw = kernel_shape
+    windows = window_view(A_prev, kernel_shape, stride)
+    m, h_new, w_new = windows.shape[:3]
+    c = A_prev.shape[3]
+    cache = {'shape': A_prev.shape, 'dtype': A_prev.dtype,
+             'kernel_shape': kernel_shape, 'stride': stride, 'mode': mode}
+
+    if mode != 'max':
+        A = windows.mean(axis=(3, 4))
+    elif ties:
+        A = windows.max(axis=(3, 4))
+        cache['mask'] = windows == A[:, :, :, np.newaxis, np.newaxis, :]
+    else:
+        cols = windows.reshape(m, h_new, w_new, kh * kw, c)
+        argmax = cols.argmax(axis=3)
+        A = np.take_along_axis(cols, argmax[:, :, :, np.newaxis], axis=3)
+        A = A[:, :, :, 0]
+        cache['argmax'] = argmax
+
+    return A.astype(out_dtype(A_prev), copy=False), cache
+
+
+def pool_grad(dA, cache):
+    """
+    back propagates dA through a pooling layer without python loops
+        ...over examples, pixels or channels
+
+    dA is a numpy.ndarray of shape (m, h_new, w_new, c)
+        ...containing the partial derivatives with respect
+        ...to the output of the pooling layer
+    cache is the cache returned by pool_cache
+    Returns: the partial derivatives with respect to the previous layer
+    """
+    kh, kw = cache['kernel_shape']
+    mode = cache['mode']
+    dA_b = dA[:, :, :, np.newaxis, np.newaxis, :]
+
+    if mode == 'max' and 'argmax' in cache:
+        return scatter_argmax(dA, cache)
+    if mode == 'max':
+        grad = cache['mask'] * dA_b
+    else:
+        m, h_new, w_new, c = dA.shape
+        grad = np.broadcast_to(dA_b / (kh * kw),
+                               (m, h_new, w_new, kh, kw, c))
+    return col2im(grad, cache['shape'], (kh, kw), cache['stride'],
+                  cache['dtype'])
+
+
+def scatter_argmax(dA, cache):
+    """
+    sends each element of dA back to the argmax of its window
+
+    non-overlapping windows have unique targets and are written with a
+        ...single fancy-index assignment; overlapping windows may share a
+        ...target, so their contributions are summed with np.bincount
+    """
+    m, h_prev, w_prev, c = cache['shape']
+    kh, kw = cache['kernel_shape']
+    sh, sw = cache['stride']
+    h_new, w_new = dA.shape[1:3]
+    argmax = cache['argmax']
+
+    rows = np.arange(h_new)[:, np.newaxis, np.newaxis] * sh + argmax // kw
+    cols = np.arange(w_new)[:, np.newaxis] * sw + argmax % kw
+    flat = (((np.arange(m)[:, np.newaxis, np.newaxis, np.newaxis] * h_prev +
+              rows) * w_prev + cols) * c + np.arange(c)).ravel()
+
+    size = m * h_prev * w_prev * c
+    if sh >= kh and sw >= kw:
+        dA_prev = np.zeros(size, dtype=cache['dtype'])
+        dA_prev[flat] = dA.ravel()
+    else:
+        dA_prev = np.bincount(flat, weights=dA.ravel(), minlength=size)
+        dA_prev = dA_prev.astype(cache['dtype'], copy=False)
+    return dA_prev.reshape(cache['shape'])
+
+
+def out_dtype(A_prev):
+    """float dtype pooled outputs are returned in"""
+    if np.issubdtype(A_prev.dtype, np.floating):
+        return A_prev.dtype
+    return np.float64
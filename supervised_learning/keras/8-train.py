@@ -8,7 +8,8 @@ import tensorflow.keras as K
 def train_model(network, data, labels, batch_size,
                 epochs, validation_data=None, early_stopping=False,
                 patience=0, learning_rate_decay=False, alpha=0.1, decay_rate=1,
-                save_best=False, filepath=None, verbose=True, shuffle=False):
+                save_best=False, filepath=None, verbose=True, shuffle=False,
+                schedule=None):
     """
     network: model to train
     data: numpy.ndarray of shape (m, nx) containing the input data
@@ -40,6 +41,9 @@ def train_model(network, data, labels, batch_size,
         whether to shuffle the batches every epoch
         ...normally, it is a good idea to shuffle, but for reproducibility,
             we have chosen to set the default to False.
+    schedule: learning rate table indexed by epoch, such as one made by
+        optimization/lr_schedules; used instead of the inverse time decay
+        of learning_rate_decay, with or without validation_data
     Returns the History object generated after training the model
     """
     callbacks = []
@@ -51,7 +55,7 @@ def train_model(network, data, labels, batch_size,
                 )
             callbacks.append(early_stopping)
 
-        if learning_rate_decay:
+        if learning_rate_decay and schedule is None:
             def scheduler(epoch):
                 return alpha / (1 + decay_rate * epoch)
             lr_decay = K.callbacks.LearningRateScheduler(scheduler, verbose=1)
@@ -64,6 +68,11 @@ def train_model(network, data, labels, batch_size,
                 )
             callbacks.append(checkpoint)
 
+    if schedule is not None:
+        def table(epoch):
+            return float(schedule[min(epoch, len(schedule) - 1)])
+        callbacks.append(K.callbacks.LearningRateScheduler(table, verbose=1))
+
     history = network.fit(x=data, y=labels,
                           batch_size=batch_size,
                           epochs=epochs,
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+normalization_constants = __import__(
+    '0-norm_constants').normalization_constants
+normalize = __import__('1-normalize').normalize
+sn = __import__('streaming_normalization')
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    m, nx, chunk_size = 200000, 256, 8192
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'X.npy')
+    X = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float32,
+                                  shape=(m, nx))
+    for chunk in sn.chunks(X, chunk_size):
+        chunk[...] = np.random.normal(5, 3, chunk.shape)
+    X.flush()
+    del X
+    size = m * nx * 4
+    print("X {} float32, {:.0f} MB on disk".format((m, nx), size / 2 ** 20))
+
+    # in float64: float32 sums over 200000 points lose about 1e-5
+    X = np.load(filename).astype(np.float64)
+    start = time.perf_counter()
+    mean, std = normalization_constants(X)
+    print("in memory: {:.3f}s".format(time.perf_counter() - start))
+    expected = normalize(X, mean, std)
+    del X
+
+    tracemalloc.start()
+    X = np.load(filename, mmap_mode='r')
+    start = time.perf_counter()
+    moments = sn.RunningMoments().update_all(sn.chunks(X, chunk_size))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("streamed: {:.3f}s, peak {:.1f} MB, mean {}, std {}".format(
+        elapsed, peak / 2 ** 20, np.allclose(moments.mean, mean),
+        np.allclose(moments.std, std)))
+
+    start = time.perf_counter()
+    parallel = sn.parallel_moments(filename, 2, chunk_size)
+    print("2 workers: {:.3f}s, mean {}, std {}".format(
+        time.perf_counter() - start, np.allclose(parallel.mean, mean),
+        np.allclose(parallel.std, std)))
+
+    constants = os.path.join(directory, 'constants.npz')
+    moments.save(constants)
+    mean, std = sn.RunningMoments.load(constants).constants()
+    X = np.load(filename, mmap_mode='r+')
+    sn.normalize_chunks(X, mean, std, chunk_size)
+    print("normalized in place:", np.allclose(X, expected, atol=1e-5))
+    del X
+    shutil.rmtree(directory)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+batch_norm = __import__('13-batch_norm').batch_norm
+BatchNorm = __import__('batch_norm_layer').BatchNorm
+
+
+def timed(function, repeat=20):
+    """best wall time of function over repeat calls"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    m, nx, n = 4096, 512, 1024
+    A = np.random.randn(m, nx)
+    W = np.random.randn(nx, n) / np.sqrt(nx)
+    b = np.random.randn(1, n)
+    Z = np.matmul(A, W) + b
+    layer = BatchNorm(n, momentum=0.9)
+    layer.gamma = np.random.rand(1, n)
+    layer.beta = np.random.rand(1, n)
+
+    same = np.allclose(layer.forward(Z),
+                       batch_norm(Z, layer.gamma, layer.beta, 1e-8))
+    print("Z {}, same output as batch_norm: {}".format(Z.shape, same))
+    old = timed(lambda: batch_norm(Z, layer.gamma, layer.beta, 1e-8))
+    new = timed(lambda: layer.forward(Z))
+    print("forward: batch_norm {:.2f}ms, BatchNorm {:.2f}ms, {:.2f}x".format(
+        old * 1000, new * 1000, old / new))
+    dout = np.random.randn(m, n)
+    print("backward: {:.2f}ms".format(
+        timed(lambda: layer.backward(dout)) * 1000))
+
+    for _ in range(100):
+        layer.forward(np.matmul(A, W) + b)
+    W_fold, b_fold = layer.fold(W, b)
+    inference = layer.forward(np.matmul(A, W) + b, training=False)
+    print("folded layer matches inference: {}".format(
+        np.allclose(np.matmul(A, W_fold) + b_fold, inference)))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import tensorflow as tf
+model = __import__('15-model').model
+EarlyStopping = __import__('early_stopping').EarlyStopping
+
+
+def one_hot(Y, classes):
+    """convert an array to a one-hot matrix"""
+    oh = np.zeros((Y.shape[0], classes))
+    oh[np.arange(Y.shape[0]), Y] = 1
+    return oh
+
+
+if __name__ == '__main__':
+    lib = np.load('../data/MNIST.npz')
+    X_train_3D = lib['X_train']
+    Y_train = lib['Y_train']
+    X_train = X_train_3D.reshape((X_train_3D.shape[0], -1))
+    Y_train_oh = one_hot(Y_train, 10)
+    X_valid_3D = lib['X_valid']
+    Y_valid = lib['Y_valid']
+    X_valid = X_valid_3D.reshape((X_valid_3D.shape[0], -1))
+    Y_valid_oh = one_hot(Y_valid, 10)
+
+    layer_sizes = [256, 256, 10]
+    activations = [tf.nn.tanh, tf.nn.tanh, None]
+
+    np.random.seed(0)
+    tf.set_random_seed(0)
+    stopper = EarlyStopping(threshold=0, patience=2)
+    save_path = model((X_train, Y_train_oh), (X_valid, Y_valid_oh),
+                      layer_sizes, activations, epochs=20,
+                      save_path='./model.ckpt', early_stopping=stopper)
+    print("Best validation cost {} after {} epochs".format(
+        stopper.best_cost, stopper.best_step))
+    print('Model saved in path: {}'.format(save_path))
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """big big network ooh ahh"""
 import tensorflow as tf
-import numpy as np
+MiniBatches = __import__('mini_batch_iterator').MiniBatches
 
 
 def calculate_accuracy(y, y_pred):
@@ -55,7 +55,8 @@ def forward_prop(x, epsilon, layer_sizes=[], activations=[]):
 def model(
     Data_train, Data_valid, layers, activations, alpha=0.001, beta1=0.9,
     beta2=0.999, epsilon=1e-8, decay_rate=1, batch_size=32,
-    epochs=5, save_path='/tmp/model.ckpt'
+    epochs=5, save_path='/tmp/model.ckpt', early_stopping=None,
+    schedule=None
         ):
     """
     builds, trains, and saves a neural network model in tensorflow using
@@ -75,6 +76,11 @@ def model(
     batch_size: number of data points that should be in a mini-batch
     epochs: number of times the training should pass through the whole dataset
     save_path: path where the model should be saved to
+    early_stopping: optional early_stopping.EarlyStopping controller, given
+        the validation cost after each epoch it is due; training stops when
+        it says so and the model is saved with the best weights it kept
+    schedule: optional learning rate table from lr_schedules, indexed by
+        the global step (mini-batch); replaces alpha and decay_rate
     Returns the path where the model was saved
     """
     X_train, Y_train = Data_train
@@ -95,10 +101,14 @@ def model(
     decay_step = X_train.shape[0] // batch_size
     if decay_step % batch_size != 0:
         decay_step += 1
-    alpha = tf.train.inverse_time_decay(
-                                  alpha, global_step, decay_step,
-                                  decay_rate, staircase=True
-                                  )
+    if schedule is None:
+        alpha = tf.train.inverse_time_decay(
+                                      alpha, global_step, decay_step,
+                                      decay_rate, staircase=True
+                                      )
+    else:
+        alpha = tf.gather(tf.constant(schedule, dtype=tf.float32),
+                          tf.minimum(global_step, len(schedule) - 1))
     train_op = tf.train.AdamOptimizer(
         alpha, beta1, beta2, epsilon
         ).minimize(loss, global_step)
@@ -106,6 +116,8 @@ def model(
     init = tf.global_variables_initializer()
     with tf.Session() as sess:
         sess.run(init)
+        variables = tf.trainable_variables()
+        batches = MiniBatches(X_train, Y_train, batch_size)
         for epoch in range(epochs + 1):
             tLoss = loss.eval({x: X_train, y: Y_train})
             tAccuracy = accuracy.eval({x: X_train, y: Y_train})
@@ -116,20 +128,23 @@ def model(
             print("\tTraining Accuracy: {}".format(tAccuracy))
             print("\tValidation Cost: {}".format(vLoss))
             print("\tValidation Accuracy: {}".format(vAccuracy))
+            if early_stopping is not None and early_stopping.due(epoch) \
+                    and early_stopping.update(
+                        vLoss, lambda: sess.run(variables)):
+                break
             if epoch == epochs:
                 break
-            shuff = np.random.permutation(len(X_train))
-            X_shuff, Y_shuff = X_train[shuff], Y_train[shuff]
-            for step in range(0, X_train.shape[0], batch_size):
-                feed = {
-                    x: X_shuff[step:step+batch_size],
-                    y: Y_shuff[step:step+batch_size]
-                    }
+            for step, (X_batch, Y_batch) in enumerate(batches, 1):
+                feed = {x: X_batch, y: Y_batch}
                 sess.run(train_op, feed)
-                if not ((step // batch_size + 1) % 100):
-                    print("\tStep {}:".format(step//batch_size+1))
+                if not (step % 100):
+                    print("\tStep {}:".format(step))
                     mini_loss, mini_acc = loss.eval(feed), accuracy.eval(feed)
                     print("\t\tCost: {}".format(mini_loss))
                     print("\t\tAccuracy: {}".format(mini_acc))
+        if early_stopping is not None:
+            early_stopping.restore(lambda values: [
+                variable.load(value, sess)
+                for variable, value in zip(variables, values)])
         saver = tf.train.Saver()
         return saver.save(sess, save_path)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Train mini batch"""
 import tensorflow as tf
-shuffle_data = __import__('2-shuffle_data').shuffle_data
+MiniBatches = __import__('mini_batch_iterator').MiniBatches
 
 
 def train_mini_batch(X_train, Y_train,
@@ -20,7 +20,7 @@ def train_mini_batch(X_train, Y_train,
         loss = tf.get_collection("loss")[0]
         train_op = tf.get_collection("train_op")
 
-        m = X_train.shape[0]
+        batches = MiniBatches(X_train, Y_train, batch_size)
 
         train_cost = sess.run(loss, feed_dict={x: X_train, y: Y_train})
         train_accuracy = sess.run(accuracy, feed_dict={x: X_train, y: Y_train})
@@ -33,17 +33,7 @@ def train_mini_batch(X_train, Y_train,
         print("\tValidation Accuracy: {}".format(valid_accuracy))
 
         for epoch in range(epochs):
-            X_shuffled, Y_shuffled = shuffle_data(X_train, Y_train)
-            steps = m // batch_size
-            if steps * batch_size < m:
-                steps += 1
-            for i in range(steps):
-                start = i * batch_size
-                end = i * batch_size + batch_size
-                if end > m:
-                    end = m
-                X_batch = X_shuffled[start:end]
-                Y_batch = Y_shuffled[start:end]
+            for i, (X_batch, Y_batch) in enumerate(batches):
                 sess.run(train_op, feed_dict={x: X_batch, y: Y_batch})
                 if i != 0 and (i + 1) % 100 == 0:
                     cost = sess.run(loss, feed_dict={x: X_batch, y: Y_batch})
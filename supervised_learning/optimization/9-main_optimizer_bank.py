@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+update_variables_momentum = __import__('5-momentum').update_variables_momentum
+update_variables_RMSProp = __import__('7-RMSProp').update_variables_RMSProp
+update_variables_Adam = __import__('9-Adam').update_variables_Adam
+optimizer_bank = __import__('optimizer_bank')
+
+
+def network(sizes):
+    """weights and biases of a network with layers of the given sizes"""
+    params = {}
+    for layer in range(1, len(sizes)):
+        params['W{}'.format(layer)] = np.random.randn(sizes[layer],
+                                                      sizes[layer - 1])
+        params['b{}'.format(layer)] = np.zeros((sizes[layer], 1))
+    return params
+
+
+def per_variable(name, params, grads, steps):
+    """steps of the per-variable functions, returns the time and params"""
+    params = {key: value.copy() for key, value in params.items()}
+    v = {key: np.zeros_like(value) for key, value in params.items()}
+    s = {key: np.zeros_like(value) for key, value in params.items()}
+    start = time.perf_counter()
+    for t in range(1, steps + 1):
+        for key in params:
+            if name == 'Momentum':
+                params[key], v[key] = update_variables_momentum(
+                    0.01, 0.9, params[key], grads[t % 2][key], v[key])
+            elif name == 'RMSProp':
+                params[key], s[key] = update_variables_RMSProp(
+                    0.01, 0.9, 1e-8, params[key], grads[t % 2][key], s[key])
+            else:
+                params[key], v[key], s[key] = update_variables_Adam(
+                    0.01, 0.9, 0.99, 1e-8, params[key], grads[t % 2][key],
+                    v[key], s[key], t)
+    return time.perf_counter() - start, params
+
+
+def banked(name, params, grads, steps):
+    """steps of an optimizer bank, returns the time and params"""
+    params = {key: value.copy() for key, value in params.items()}
+    if name == 'Momentum':
+        bank = optimizer_bank.Momentum(params, 0.01, 0.9)
+    elif name == 'RMSProp':
+        bank = optimizer_bank.RMSProp(params, 0.01, 0.9, 1e-8)
+    else:
+        bank = optimizer_bank.Adam(params, 0.01, 0.9, 0.99, 1e-8)
+    elapsed = 0.0
+    for t in range(1, steps + 1):
+        # a training loop computes the gradients straight into bank.grads,
+        # so copying them there is not part of the step
+        for key, view in bank.grads.items():
+            np.copyto(view, grads[t % 2][key])
+        start = time.perf_counter()
+        bank.step()
+        elapsed += time.perf_counter() - start
+    return elapsed, params
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    for width, steps in [(32, 2000), (256, 200)]:
+        sizes = [784] + [width] * 9 + [10]
+        params = network(sizes)
+        grads = [{key: np.random.randn(*value.shape) * 0.1
+                  for key, value in params.items()} for _ in range(2)]
+        count = sum(value.size for value in params.values())
+        print("10 layers of width {}, {} parameters, {} steps".format(
+            width, count, steps))
+        for name in ['Momentum', 'RMSProp', 'Adam']:
+            old, expected = per_variable(name, params, grads, steps)
+            new, result = banked(name, params, grads, steps)
+            same = all(np.allclose(result[key], expected[key])
+                       for key in params)
+            print("\t{:>8}: per variable {:.3f}s, bank {:.3f}s, speedup"
+                  " {:.2f}x, same weights: {}".format(
+                      name, old, new, old / new, same))
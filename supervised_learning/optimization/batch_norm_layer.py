@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+batch normalization layer with a backward pass and an inference path
+"""
+import numpy as np
+
+
+class BatchNorm:
+    """
+    Batch normalization of the unactivated outputs Z of a layer, like
+        batch_norm, for Z of shape (m, n) of m data points
+
+    Training: Z is centered once into a cached buffer, the variance is a
+        single reduction over that centered buffer (no squared copy of Z),
+        and the buffer is scaled in place into the normalized Z, which is
+        cached with the inverse standard deviation for backward
+    The statistics are two-pass (the mean, then the sum of squares of the
+        centered Z), which is as stable as Welford's single pass; the
+        normalization needs the centered Z anyway, and a single-pass
+        merge of per-block moments (Chan et al.) measured no faster,
+        its per-block calls costing what the saved pass over Z does
+    backward uses the analytic gradient of the whole normalization, so
+        it takes a few passes over dZ and no intermediate graph
+    Inference: the exponential running mean and variance kept during
+        training replace the batch statistics, and reduce to one scale
+        and shift per feature, which fold folds into the weights of the
+        preceding layer
+    """
+    def __init__(self, n, epsilon=1e-8, momentum=0.99, dtype=np.float64):
+        """
+        n: number of features of Z
+        epsilon: small number used to avoid division by zero
+        momentum: weight of the running statistics in their exponential
+            moving average, e.g. 0.99
+        dtype: floating point type of the parameters and statistics
+        """
+        self.epsilon = epsilon
+        self.momentum = momentum
+        self.gamma = np.ones((1, n), dtype=dtype)
+        self.beta = np.zeros((1, n), dtype=dtype)
+        self.running_mean = np.zeros((1, n), dtype=dtype)
+        self.running_var = np.ones((1, n), dtype=dtype)
+        self.__Znorm = None
+        self.__inv_std = None
+
+    def forward(self, Z, training=True):
+        """
+        Z: numpy.ndarray of shape (m, n) that should be normalized
+        training: whether to normalize with the statistics of the batch
+            (and update the running statistics) or with the running ones
+        Returns the normalized, scaled and shifted Z
+        """
+        if not training:
+            scale, shift = self.scale_shift()
+            out = np.multiply(Z, scale)
+            out += shift
+            return out
+        m = Z.shape[0]
+        mean = np.mean(Z, axis=0, keepdims=True)
+        if self.__Znorm is None or self.__Znorm.shape != Z.shape or \
+                self.__Znorm.dtype != self.gamma.dtype:
+            self.__Znorm = np.empty(Z.shape, dtype=self.gamma.dtype)
+        Znorm = self.__Znorm
+        np.subtract(Z, mean, out=Znorm)
+        variance = np.einsum('ij,ij->j', Znorm, Znorm)[np.newaxis] / m
+        inv_std = 1 / np.sqrt(variance + self.epsilon)
+        Znorm *= inv_std
+        self.__inv_std = inv_std
+
+        self.running_mean *= self.momentum
+        self.running_mean += (1 - self.momentum) * mean
+        self.running_var *= self.momentum
+        self.running_var += (1 - self.momentum) * variance
+
+        out = np.multiply(Znorm, self.gamma)
+        out += self.beta
+        return out
+
+    def backward(self, dout):
+        """
+        dout: numpy.ndarray of shape (m, n), the gradient of the cost with
+            respect to the output of the last training forward
+        Returns the gradients of the cost with respect to Z, gamma and beta
+        """
+        if self.__Znorm is None:
+            raise ValueError("backward needs a training forward first")
+        Znorm = self.__Znorm
+        m = dout.shape[0]
+        dbeta = np.sum(dout, axis=0, keepdims=True)
+        dgamma = np.einsum('ij,ij->j', dout, Znorm)[np.newaxis]
+        # dZ = gamma * inv_std / m * (m * dout - dbeta - Znorm * dgamma)
+        dZ = np.multiply(Znorm, -dgamma / m)
+        dZ -= dbeta / m
+        dZ += dout
+        dZ *= self.gamma * self.__inv_std
+        return dZ, dgamma, dbeta
+
+    def scale_shift(self):
+        """
+        Returns the scale and shift of shape (1, n) that normalize with
+            the running statistics: gamma * (Z - mean) / std + beta
+            = Z * scale + shift
+        """
+        scale = self.gamma / np.sqrt(self.running_var + self.epsilon)
+        shift = self.beta - self.running_mean * scale
+        return scale, shift
+
+    def fold(self, W, b):
+        """
+        Folds the inference normalization into the preceding layer, whose
+            unactivated output is Z = np.matmul(A, W) + b
+        W: numpy.ndarray of shape (nx, n), the weights of that layer
+        b: numpy.ndarray of shape (1, n), the biases of that layer
+        Returns the weights and biases of a layer computing the
+            normalized Z directly
+        """
+        scale, shift = self.scale_shift()
+        return W * scale, b * scale + shift
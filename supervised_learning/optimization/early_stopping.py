@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+early stopping controller that keeps the best weights of a training run
+"""
+import numpy as np
+
+
+class EarlyStopping:
+    """
+    Decides when training should stop, like early_stopping, and keeps
+        a copy of the weights with the lowest validation cost
+
+    weights, wherever they are passed, are either a dict or list of
+        numpy.ndarrays that training updates in place (the weights of a
+        NumPy network), or, for weights that live elsewhere such as
+        TensorFlow variables, a function: snapshot calls it with no
+        arguments to get the current arrays, restore calls it with the
+        best arrays to assign them
+    The copy is kept in one flat buffer allocated on the first snapshot;
+        later snapshots copy into it without reallocating
+
+    Usage in a training loop, with validation run only every N steps:
+        stopper = EarlyStopping(threshold, patience, every=N)
+        for step in range(iterations):
+            ... one training step ...
+            if stopper.due(step) and stopper.update(validation_cost(),
+                                                    weights):
+                break
+        stopper.restore(weights)
+    """
+    def __init__(self, threshold=0, patience=1, every=1):
+        """
+        threshold: the decrease of the validation cost needed for a step
+            to count as an improvement
+        patience: the number of validations in a row without improvement
+            after which training should stop
+        every: validate on one step in every this many
+        """
+        if not isinstance(every, int) or every < 1:
+            raise ValueError("every must be a positive integer")
+        self.threshold = threshold
+        self.patience = patience
+        self.every = every
+        self.count = 0
+        self.best_cost = np.inf
+        self.best_step = None
+        self.step = -1
+        self.__buffer = None
+        self.__views = None
+
+    def due(self, step):
+        """
+        Returns whether the validation cost should be computed at step
+        """
+        self.step = step
+        return step % self.every == 0
+
+    def update(self, cost, weights=None):
+        """
+        Records the validation cost of the current step
+        cost: the current validation cost
+        weights: the current weights, snapshotted if cost is the lowest
+            so far
+        Returns whether training should stop
+        """
+        if self.best_cost - cost > self.threshold:
+            self.count = 0
+        else:
+            self.count += 1
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.best_step = self.step
+            if weights is not None:
+                self.snapshot(weights)
+        return self.count >= self.patience
+
+    def snapshot(self, weights):
+        """
+        Copies weights into the buffer of best weights
+        """
+        arrays = self.__arrays(weights() if callable(weights) else weights)
+        if self.__views is None or \
+                [view.shape for view in self.__views] != \
+                [np.shape(array) for array in arrays]:
+            sizes = [np.size(array) for array in arrays]
+            self.__buffer = np.empty(sum(sizes),
+                                     dtype=np.result_type(*arrays))
+            self.__views, start = [], 0
+            for array, size in zip(arrays, sizes):
+                self.__views.append(
+                    self.__buffer[start:start + size].reshape(
+                        np.shape(array)))
+                start += size
+        for view, array in zip(self.__views, arrays):
+            np.copyto(view, array)
+
+    def restore(self, weights):
+        """
+        Restores the best weights snapshotted so far, if any
+        Returns the list of best arrays, or None if there are none
+        """
+        if self.__views is None:
+            return None
+        if callable(weights):
+            weights(self.__views)
+        else:
+            for array, view in zip(self.__arrays(weights), self.__views):
+                np.copyto(array, view)
+        return self.__views
+
+    @staticmethod
+    def __arrays(weights):
+        """The arrays of a dict (in key order) or list of weights"""
+        if isinstance(weights, dict):
+            return list(weights.values())
+        return list(weights)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+learning rate schedules precomputed as per-step tables in numpy
+
+Every schedule returns a numpy.ndarray of shape (steps,) whose element t
+    is the learning rate of step t (step 0 being the first), so a training
+    loop looks it up with table[t] and no schedule is evaluated in the
+    loop. A step can be a gradient descent pass or an epoch, as long as
+    the table is indexed the same way. Tables compose as arrays: warmup
+    ramps up the start of any table, and np.concatenate chains them
+"""
+import numpy as np
+
+
+def lookup(table, step):
+    """
+    Returns the learning rate of step in table, the last one past its end
+    """
+    return table[min(step, len(table) - 1)]
+
+
+def inverse_time(alpha, decay_rate, decay_step, steps, staircase=True):
+    """
+    Inverse time decay, like learning_rate_decay
+    alpha: original learning rate
+    decay_rate: weight used to determine the rate at which alpha will decay
+    decay_step: number of steps that should occur before alpha is decayed
+        further
+    steps: number of steps in the table
+    staircase: whether alpha decays in a stepwise fashion
+    """
+    t = np.arange(steps) / decay_step
+    if staircase:
+        t = np.floor(t)
+    return alpha / (1 + decay_rate * t)
+
+
+def step_decay(alpha, drop, decay_step, steps):
+    """
+    Step decay: alpha multiplied by drop every decay_step steps
+    """
+    return alpha * drop ** (np.arange(steps) // decay_step)
+
+
+def exponential(alpha, decay_rate, decay_step, steps, staircase=False):
+    """
+    Exponential decay: alpha * decay_rate ** (step / decay_step)
+    """
+    t = np.arange(steps) / decay_step
+    if staircase:
+        t = np.floor(t)
+    return alpha * decay_rate ** t
+
+
+def cosine_restarts(alpha, period, steps, t_mul=2, m_mul=1, alpha_min=0):
+    """
+    Cosine annealing with warm restarts (SGDR): each cycle anneals the
+        learning rate from its maximum to alpha_min along a half cosine,
+        then restarts
+    alpha: maximum learning rate of the first cycle
+    period: number of steps of the first cycle
+    t_mul: factor of the length of each cycle over the previous one
+    m_mul: factor of the maximum of each cycle over the previous one
+    alpha_min: minimum learning rate
+    """
+    table = np.empty(steps)
+    start, length, maximum = 0, period, alpha
+    while start < steps:
+        stop = min(start + int(length), steps)
+        t = np.arange(stop - start) / length
+        table[start:stop] = alpha_min + (maximum - alpha_min) * \
+            (1 + np.cos(np.pi * t)) / 2
+        start = stop
+        length *= t_mul
+        maximum *= m_mul
+    return table
+
+
+def one_cycle(alpha_max, steps, pct_start=0.3, div=25, final_div=1e4):
+    """
+    One-cycle policy: the learning rate rises from alpha_max / div to
+        alpha_max over the first pct_start of the steps, then anneals
+        down to alpha_max / final_div, both along half cosines
+    """
+    up = max(int(steps * pct_start), 1)
+    down = steps - up
+    table = np.empty(steps)
+    low, high, end = alpha_max / div, alpha_max, alpha_max / final_div
+    table[:up] = high + (low - high) * (1 + np.cos(np.pi * np.arange(up) /
+                                                   up)) / 2
+    table[up:] = end + (high - end) * (1 + np.cos(np.pi * np.arange(down) /
+                                                  max(down, 1))) / 2
+    return table
+
+
+def warmup(table, warmup_steps, start=0):
+    """
+    Linear warmup: the first warmup_steps of table ramp linearly from
+        start to the learning rate table reaches at step warmup_steps
+    Returns a new table
+    """
+    table = np.array(table, dtype=float)
+    warmup_steps = min(warmup_steps, len(table))
+    if warmup_steps:
+        target = lookup(table, warmup_steps)
+        table[:warmup_steps] = start + (target - start) * \
+            np.arange(warmup_steps) / warmup_steps
+    return table
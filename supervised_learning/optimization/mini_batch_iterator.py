@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+mini-batches of shuffled data gathered into reused buffers
+"""
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+class MiniBatches:
+    """
+    Iterates over the mini-batches of one epoch of X and Y, shuffled the
+        same way, like shuffle_data followed by slicing, without copying
+        the whole dataset every epoch
+
+    Each iteration draws a permutation of the indices (with
+        np.random.permutation, as shuffle_data does, so a seeded run sees
+        the same batches) and gathers every batch from X and Y with
+        np.take into a buffer that is reused across batches and epochs.
+        X and Y can be np.memmap arrays: only the rows of the current
+        batch are read from disk
+    With prefetch, the next batch is gathered on a background thread
+        while the current one is used; np.take releases the GIL, so the
+        gather (and the disk reads of a memmap) overlap the training step
+
+    The arrays yielded are views of the buffers: a batch is only valid
+        until the next one is requested, and should be copied to be kept.
+        Without shuffling, batches are plain slices of X and Y
+    """
+    def __init__(self, X, Y, batch_size=32, shuffle=True, prefetch=True):
+        """
+        X: numpy.ndarray (or np.memmap) of shape (m, ...) of inputs
+        Y: numpy.ndarray (or np.memmap) of shape (m, ...) of labels
+        batch_size: number of data points in a mini-batch; the last
+            batch of an epoch holds the remainder
+        shuffle: whether to shuffle the data points every epoch
+        prefetch: whether to gather the next batch on a background thread
+        """
+        if X.shape[0] != Y.shape[0]:
+            raise ValueError("X and Y must have the same number of "
+                             "data points")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.X = X
+        self.Y = Y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.prefetch = prefetch
+        self.__buffers = None
+
+    def __len__(self):
+        """Number of mini-batches in an epoch"""
+        return -(-self.X.shape[0] // self.batch_size)
+
+    def __gather(self, order, start, slot):
+        """
+        Gathers the batch starting at position start of order into the
+            buffers of slot
+        Returns the batch of X and of Y
+        """
+        stop = min(start + self.batch_size, self.X.shape[0])
+        if order is None:
+            return self.X[start:stop], self.Y[start:stop]
+        if self.__buffers is None:
+            self.__buffers = [
+                tuple(np.empty((self.batch_size,) + A.shape[1:],
+                               dtype=A.dtype) for A in (self.X, self.Y))
+                for _ in range(2 if self.prefetch else 1)]
+        indices = order[start:stop]
+        batch = []
+        for A, buffer in zip((self.X, self.Y), self.__buffers[slot]):
+            out = buffer[:stop - start]
+            # the indices are in range; mode='clip' skips the buffered
+            # bounds check of mode='raise'
+            np.take(A, indices, axis=0, out=out, mode='clip')
+            batch.append(out)
+        return tuple(batch)
+
+    def __iter__(self):
+        """Yields the (X_batch, Y_batch) of one epoch"""
+        m = self.X.shape[0]
+        order = np.random.permutation(m) if self.shuffle else None
+        starts = range(0, m, self.batch_size)
+        if not self.prefetch or order is None:
+            for start in starts:
+                yield self.__gather(order, start, 0)
+            return
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.__gather, order, 0, 0)
+            for k, start in enumerate(starts):
+                batch = pending.result()
+                if start + self.batch_size < m:
+                    # batch k - 1 was in the other slot, and is done with
+                    pending = pool.submit(self.__gather, order,
+                                          start + self.batch_size,
+                                          (k + 1) % 2)
+                yield batch
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Momentum, RMSProp and Adam over flat buffers holding every parameter
+"""
+import numpy as np
+
+# number of elements step updates at a time: every pass of an update over
+# one chunk of the parameters, gradients, moments and scratch (5 arrays of
+# 128 KiB in float64) stays in the L2 cache, so only the first pass reads
+# them from memory
+CHUNK = 16384
+
+
+def views(flat, shapes):
+    """Splits a flat array into consecutive arrays of the given shapes"""
+    arrays, start = [], 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        arrays.append(flat[start:start + size].reshape(shape))
+        start += size
+    return arrays
+
+
+class OptimizerBank:
+    """
+    Packs the parameters of a model, their gradients and moments into
+        contiguous flat buffers, so one optimization step updates the
+        whole model in a few in-place ufunc calls instead of one set of
+        temporaries per variable
+
+    The parameters are copied into the flat buffer once, and the arrays
+        of the parameters dictionary are replaced by views of it: the
+        model keeps reading and writing its weights as before, and every
+        step updates them in place. grads holds a view of the flat
+        gradient buffer per parameter, under the same keys; gradients
+        computed straight into them (e.g. with np.matmul(..., out=...))
+        cost no copy at all
+    The update runs CHUNK elements at a time, so each of its passes
+        reads the chunk from the cache rather than from memory
+    """
+    def __init__(self, params, alpha):
+        """
+        params: dictionary of numpy.ndarrays, the parameters to optimize;
+            its arrays are replaced by views of the flat buffer
+        alpha: learning rate, or a learning rate table from lr_schedules,
+            indexed by the number of steps taken before the current one
+        """
+        self.alpha = alpha
+        self.lr = None
+        self.params = params
+        keys = list(params)
+        arrays = [np.asarray(params[key]) for key in keys]
+        dtype = np.result_type(*arrays)
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        shapes = [array.shape for array in arrays]
+        count = sum(array.size for array in arrays)
+        self.flat = np.empty(count, dtype=dtype)
+        self.flat_grads = np.zeros(count, dtype=dtype)
+        self.__scratch = np.empty(min(count, CHUNK), dtype=dtype)
+        for key, view, array in zip(keys, views(self.flat, shapes), arrays):
+            view[...] = array
+            params[key] = view
+        self.grads = dict(zip(keys, views(self.flat_grads, shapes)))
+        self.t = 0
+
+    def moment(self):
+        """Returns a zeroed flat moment buffer"""
+        return np.zeros_like(self.flat)
+
+    def step(self, grads=None):
+        """
+        Updates every parameter in place
+        grads: dictionary of gradients to copy into grads first, with
+            the same keys as the parameters; None when the gradients were
+            already written into grads
+        """
+        if grads is not None:
+            for key, view in self.grads.items():
+                view[...] = grads[key]
+        if np.ndim(self.alpha):
+            self.lr = self.alpha[min(self.t, len(self.alpha) - 1)]
+        else:
+            self.lr = self.alpha
+        self.t += 1
+        for start in range(0, self.flat.size, CHUNK):
+            part = slice(start, start + CHUNK)
+            var = self.flat[part]
+            self._update(part, var, self.flat_grads[part],
+                         self.__scratch[:var.size])
+
+    def _update(self, part, var, grad, tmp):
+        """
+        Applies one step to the chunk part of the flat buffers: var and
+            grad are the chunk of the parameters and of their gradient,
+            tmp a scratch array of the same size
+        """
+        raise NotImplementedError
+
+
+class Momentum(OptimizerBank):
+    """
+    Gradient descent with momentum, like update_variables_momentum
+    """
+    def __init__(self, params, alpha, beta1):
+        """
+        beta1: momentum weight
+        """
+        super().__init__(params, alpha)
+        self.beta1 = beta1
+        self.v = self.moment()
+
+    def _update(self, part, var, grad, tmp):
+        """var -= alpha * v, after updating v"""
+        v = self.v[part]
+        # v = beta1 * v + (1 - beta1) * grad, as v += (1 - beta1)(grad - v)
+        np.subtract(grad, v, out=tmp)
+        tmp *= 1 - self.beta1
+        v += tmp
+        np.multiply(v, self.lr, out=tmp)
+        var -= tmp
+
+
+class RMSProp(OptimizerBank):
+    """
+    RMSProp, like update_variables_RMSProp
+    """
+    def __init__(self, params, alpha, beta2, epsilon):
+        """
+        beta2: RMSProp weight
+        epsilon: small number to avoid division by zero
+        """
+        super().__init__(params, alpha)
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.s = self.moment()
+
+    def _update(self, part, var, grad, tmp):
+        """var -= alpha * grad / (sqrt(s) + epsilon), after updating s"""
+        s = self.s[part]
+        np.square(grad, out=tmp)
+        tmp -= s
+        tmp *= 1 - self.beta2
+        s += tmp
+        np.sqrt(s, out=tmp)
+        tmp += self.epsilon
+        np.divide(grad, tmp, out=tmp)
+        tmp *= self.lr
+        var -= tmp
+
+
+class Adam(OptimizerBank):
+    """
+    Adam, like update_variables_Adam
+
+    The bias corrections are folded into two scalars per step instead of
+        two corrected copies of the moments:
+        alpha * v / (1 - beta1 ** t) / (sqrt(s / (1 - beta2 ** t)) + eps)
+        = alpha_t * v / (sqrt(s) + eps_t), with
+        alpha_t = alpha * sqrt(1 - beta2 ** t) / (1 - beta1 ** t) and
+        eps_t = eps * sqrt(1 - beta2 ** t)
+    """
+    def __init__(self, params, alpha, beta1, beta2, epsilon):
+        """
+        beta1: weight used for the first moment
+        beta2: weight used for the second moment
+        epsilon: small number to avoid division by zero
+        """
+        super().__init__(params, alpha)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.v = self.moment()
+        self.s = self.moment()
+
+    def _update(self, part, var, grad, tmp):
+        """var -= alpha_t * v / (sqrt(s) + eps_t), after updating v, s"""
+        v, s = self.v[part], self.s[part]
+        np.subtract(grad, v, out=tmp)
+        tmp *= 1 - self.beta1
+        v += tmp
+        np.square(grad, out=tmp)
+        tmp -= s
+        tmp *= 1 - self.beta2
+        s += tmp
+
+        correction = np.sqrt(1 - self.beta2 ** self.t)
+        np.sqrt(s, out=tmp)
+        tmp += self.epsilon * correction
+        np.divide(v, tmp, out=tmp)
+        tmp *= self.lr * correction / (1 - self.beta1 ** self.t)
+        var -= tmp
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+normalization (standardization) constants and normalization of datasets
+    streamed in chunks, for data that does not fit in memory
+"""
+from multiprocessing import Pool
+import numpy as np
+
+
+def chunks(X, chunk_size=65536):
+    """
+    Yields consecutive chunks of at most chunk_size data points of X,
+        as views (of an np.memmap, only a chunk is read at a time)
+    """
+    for start in range(0, X.shape[0], chunk_size):
+        yield X[start:start + chunk_size]
+
+
+class RunningMoments:
+    """
+    Mean and variance of each feature of a stream of data points
+
+    Every chunk is reduced to its count, mean and sum of squared
+        deviations (M2) in one vectorized pass, then merged into the
+        running statistics with the parallel update of Chan et al.,
+        which generalizes Welford's algorithm from one data point to a
+        chunk and is as stable. The statistics of separate parts of a
+        dataset (e.g. computed by worker processes) merge the same way
+    Statistics are kept in float64 whatever the dtype of the data
+    """
+    def __init__(self, nx=None):
+        """
+        nx: number of features, or None to take it from the first chunk
+        """
+        self.count = 0
+        self.mean = None if nx is None else np.zeros(nx)
+        self.M2 = None if nx is None else np.zeros(nx)
+
+    def __merge(self, count, mean, M2):
+        """Merges the statistics of count data points into these"""
+        if count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.M2 = count, mean, M2
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.M2 = self.M2 + M2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def update(self, X):
+        """
+        Adds the data points of X, a numpy.ndarray of shape (m, nx)
+        Returns the running moments
+        """
+        if X.shape[0]:
+            mean = np.mean(X, axis=0, dtype=np.float64)
+            deviations = X - mean
+            M2 = np.einsum('ij,ij->j', deviations, deviations)
+            self.__merge(X.shape[0], mean, M2)
+        return self
+
+    def merge(self, other):
+        """
+        Adds the data points summarized by other, another RunningMoments
+        Returns the running moments
+        """
+        self.__merge(other.count, other.mean, other.M2)
+        return self
+
+    def update_all(self, stream):
+        """
+        Adds every chunk of stream, any iterable of arrays of shape
+            (m, nx), such as chunks(X) or a generator reading a file
+        Returns the running moments
+        """
+        for X in stream:
+            self.update(X)
+        return self
+
+    @property
+    def variance(self):
+        """Variance of each feature (of the population, as np.var)"""
+        return self.M2 / self.count
+
+    @property
+    def std(self):
+        """Standard deviation of each feature (as np.std)"""
+        return np.sqrt(self.variance)
+
+    def constants(self):
+        """
+        Returns the mean and standard deviation of each feature, like
+            normalization_constants
+        """
+        return self.mean, self.std
+
+    def save(self, filename):
+        """Saves the statistics to filename, a .npz file"""
+        np.savez(filename, count=self.count, mean=self.mean, M2=self.M2)
+
+    @staticmethod
+    def load(filename):
+        """Returns the RunningMoments saved in filename"""
+        with np.load(filename) as saved:
+            moments = RunningMoments()
+            moments.count = int(saved['count'])
+            moments.mean = saved['mean']
+            moments.M2 = saved['M2']
+        return moments
+
+
+def _part(job):
+    """
+    Pool worker: the moments of the data points [start, stop) of the
+        .npy file filename, read chunk by chunk
+    Returns the RunningMoments of the part
+    """
+    filename, start, stop, chunk_size = job
+    X = np.load(filename, mmap_mode='r')
+    return RunningMoments().update_all(chunks(X[start:stop], chunk_size))
+
+
+def parallel_moments(filename, workers, chunk_size=65536):
+    """
+    Computes the moments of the data points of a .npy file in parallel
+    filename: .npy file of shape (m, nx), opened as an np.memmap by each
+        worker process, which reads its own contiguous part of the file
+    workers: number of worker processes
+    chunk_size: number of data points a worker reads at a time
+    Returns the merged RunningMoments
+    """
+    m = np.load(filename, mmap_mode='r').shape[0]
+    bounds = np.linspace(0, m, workers + 1).astype(int)
+    jobs = [(filename, start, stop, chunk_size)
+            for start, stop in zip(bounds, bounds[1:])]
+    moments = RunningMoments()
+    with Pool(workers) as pool:
+        for part in pool.map(_part, jobs, chunksize=1):
+            moments.merge(part)
+    return moments
+
+
+def normalize_chunks(X, m, s, chunk_size=65536):
+    """
+    Normalizes (standardizes) X in place, chunk by chunk, like normalize
+    X: numpy.ndarray of shape (d, nx) of floats, or an np.memmap opened
+        with mode 'r+' (flushed to its file at the end)
+    m: numpy.ndarray of shape (nx,), the mean of all features
+    s: numpy.ndarray of shape (nx,), the standard deviation of all
+        features
+    Returns X
+    """
+    m = np.asarray(m, dtype=X.dtype)
+    s = np.asarray(s, dtype=X.dtype)
+    for chunk in chunks(X, chunk_size):
+        chunk -= m
+        chunk /= s
+    if isinstance(X, np.memmap):
+        X.flush()
+    return X
@@ -23,9 +23,10 @@ def l2_reg_cost(cost, lambtha, weights, L, m):
     for layer_index in range(1, L + 1):
         # Add the squared norm (sum of squares of each element)
         # of the weight matrix for this layer
-        sum_of_squared_weights += np.linalg.norm(
-            weights['W' + str(layer_index)]
-            ) ** 2
+        # (in float64, even for float32 weights)
+        sum_of_squared_weights += float(np.linalg.norm(
+            weights['W' + str(layer_index)].astype(np.float64, copy=False)
+            )) ** 2
 
     # Calculate the regularization term
     regularization_term = lambtha / (2 * m) * sum_of_squared_weights
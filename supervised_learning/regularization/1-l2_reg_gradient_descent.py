@@ -22,11 +22,14 @@ def l2_reg_gradient_descent(Y, weights, cache, alpha, lambtha, L):
     Updates the weights and biases of the network using gradient descent
     """
     m = Y.shape[1]  # Number of data points
-    dZ = cache['A' + str(L)] - Y  # Calculate the error derivative
+    # Calculate the error derivative, in the dtype of the network's output
+    A_L = cache['A' + str(L)]
+    dZ = np.subtract(A_L, Y, dtype=A_L.dtype)
 
     # Loop over each layer in reverse order (from output to input)
     for layerIndex in range(L, 0, -1):
-        A = cache['A' + str(layerIndex - 1)]  # Activation of previous layer
+        # Activation of previous layer (the input data may be float64)
+        A = cache['A' + str(layerIndex - 1)].astype(dZ.dtype, copy=False)
 
         # Calculate the weight derivative (including L2 regularization term)
         dW = np.matmul(dZ, A.T) / m + (lambtha / m) * weights[
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+l2_reg_cost = __import__('0-l2_reg_cost').l2_reg_cost
+l2_reg_gradient_descent = __import__(
+    '1-l2_reg_gradient_descent').l2_reg_gradient_descent
+L2Regularizer = __import__('l2_regularizer').L2Regularizer
+
+
+def init_weights(layers, nx):
+    """random weights and zero biases of a network of the given layers"""
+    weights = {}
+    for layer, nodes in enumerate(layers, 1):
+        weights['W' + str(layer)] = np.random.randn(nodes, nx) / np.sqrt(nx)
+        weights['b' + str(layer)] = np.zeros((nodes, 1))
+        nx = nodes
+    return weights
+
+
+def forward_prop(X, weights, L):
+    """tanh / softmax forward propagation, as in 1-main.py"""
+    cache = {'A0': X}
+    for layer in range(1, L + 1):
+        Z = np.matmul(weights['W' + str(layer)], cache['A' + str(layer - 1)])
+        Z += weights['b' + str(layer)]
+        if layer == L:
+            Z = np.exp(Z - np.max(Z, axis=0))
+            cache['A' + str(layer)] = Z / np.sum(Z, axis=0)
+        else:
+            cache['A' + str(layer)] = np.tanh(Z)
+    return cache
+
+
+def cross_entropy(Y, A):
+    """cross-entropy cost of a softmax output"""
+    return -np.sum(Y * np.log(A)) / Y.shape[1]
+
+
+def step(X, Y, weights, L, alpha, lambtha):
+    """one step of the numbered functions, returns the regularized cost"""
+    cache = forward_prop(X, weights, L)
+    cost = l2_reg_cost(cross_entropy(Y, cache['A' + str(L)]), lambtha,
+                       weights, L, Y.shape[1])
+    l2_reg_gradient_descent(Y, weights, cache, alpha, lambtha, L)
+    return cost
+
+
+def regularizer_step(X, Y, regularizer, alpha):
+    """one step of L2Regularizer, returns the regularized cost"""
+    cache = regularizer.forward_prop(X)
+    cost = regularizer.cost(
+        cross_entropy(Y, cache['A' + str(regularizer.L)]), Y.shape[1])
+    regularizer.gradient_descent(Y, cache, alpha)
+    return cost
+
+
+def timed(function, repeat=20):
+    """best wall time of function over repeat calls"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    alpha, lambtha, steps = 0.1, 0.1, 300
+
+    # equivalence over many steps, on a small network
+    np.random.seed(0)
+    m, nx, layers = 128, 64, [32, 16, 10]
+    L = len(layers)
+    X = np.random.randn(nx, m)
+    Y = np.eye(10)[:, np.random.randint(0, 10, m)]
+    weights = init_weights(layers, nx)
+    regularizer = L2Regularizer({key: value.copy() for key, value
+                                 in weights.items()}, L, lambtha)
+    cost_error = 0.0
+    for _ in range(steps):
+        expected = step(X, Y, weights, L, alpha, lambtha)
+        cost_error = max(cost_error, abs(
+            regularizer_step(X, Y, regularizer, alpha) - expected))
+    lazy = regularizer.materialize()
+    weight_error = max(np.max(np.abs(lazy[key] - weights[key]))
+                       for key in weights)
+    print("{} steps, max weight difference {:.1e}, "
+          "max cost difference {:.1e}".format(steps, weight_error,
+                                              cost_error))
+
+    # time per step on a larger network
+    np.random.seed(0)
+    m, nx, layers = 256, 1024, [1024, 1024, 10]
+    L = len(layers)
+    X = np.random.randn(nx, m)
+    Y = np.eye(10)[:, np.random.randint(0, 10, m)]
+    weights = init_weights(layers, nx)
+    regularizer = L2Regularizer({key: value.copy() for key, value
+                                 in weights.items()}, L, lambtha)
+    old = timed(lambda: step(X, Y, weights, L, alpha, lambtha))
+    new = timed(lambda: regularizer_step(X, Y, regularizer, alpha))
+    print("m={}, layers {}: l2_reg_cost + l2_reg_gradient_descent "
+          "{:.2f}ms, L2Regularizer {:.2f}ms per step, {:.2f}x".format(
+              m, [nx] + layers, old * 1000, new * 1000, old / new))
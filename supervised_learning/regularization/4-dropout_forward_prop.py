@@ -5,7 +5,7 @@ conducts forward propagation using Dropout
 import numpy as np
 
 
-def dropout_forward_prop(X, weights, L, keep_prob):
+def dropout_forward_prop(X, weights, L, keep_prob, seed=None, step=0):
     """
     X: numpy.ndarray of shape (nx, m) containing the input data for the network
         nx: number of input features
@@ -13,11 +13,24 @@ def dropout_forward_prop(X, weights, L, keep_prob):
     weights: dictionary of the weights and biases of the neural network
     L: number of layers in the network
     keep_prob: the probability that A node will be kept
+    seed: optional seed of the counter-based Philox generator the masks are
+        drawn from, one independent stream per layer, so the masks of a
+        pass can be reproduced exactly; None draws them from np.random
+    step: the training step of the pass, part of the Philox key with seed
+        and the layer, so every step draws new masks from the same seed;
+        ignored when seed is None
     Returns A dictionary containing the outputs of each layer and the dropout
         mask used on each layer
+    The masks are inverted dropout masks (kept outputs are scaled by
+        1 / keep_prob) stored bit-packed along the examples axis: D{l} is a
+        uint8 array of shape (nodes, ceil(m / 8)), 1 bit per unit per
+        example; np.unpackbits(D, axis=1, count=m) restores the 0/1 mask
+    The outputs keep the dtype of the weights (X is cast to it), so float32
+        weights run the whole pass in float32; tanh and the max-shifted
+        softmax cannot overflow in either precision
     """
     outputs = {}
-    outputs["A0"] = X
+    outputs["A0"] = X.astype(weights["W1"].dtype, copy=False)
     for layer in range(1, L+1):
         W = weights["W{}".format(layer)]
         A = outputs["A{}".format(layer-1)]
@@ -25,18 +38,21 @@ def dropout_forward_prop(X, weights, L, keep_prob):
         Z = np.matmul(W, A) + b
 
         if layer == L:
-            exponentiated_values = np.exp(Z)
+            exponentiated_values = np.exp(Z - np.max(Z, axis=0))
             outputs["A{}".format(layer)] = exponentiated_values / np.sum(
                 exponentiated_values, axis=0
                 )
 
         else:
-            top = np.exp(Z) - np.exp(-Z)
-            bot = np.exp(Z) + np.exp(-Z)
-            A = top / bot
+            A = np.tanh(Z)
 
-            dX = np.random.rand(A.shape[0], A.shape[1]) < keep_prob
-            outputs["D{}".format(layer)] = dX*1
+            if seed is None:
+                dX = np.random.rand(A.shape[0], A.shape[1]) < keep_prob
+            else:
+                stream = np.random.Generator(
+                    np.random.Philox([seed, step, layer]))
+                dX = stream.random(A.shape, dtype=np.float32) < keep_prob
+            outputs["D{}".format(layer)] = np.packbits(dX, axis=1)
             A *= dX
             A /= keep_prob
             outputs["A{}".format(layer)] = A
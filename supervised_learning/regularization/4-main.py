@@ -30,4 +30,7 @@ if __name__ == '__main__':
 
     cache = dropout_forward_prop(X_train, weights, 3, 0.8)
     for k, v in sorted(cache.items()):
+        if k.startswith('D'):
+            # the masks are bit-packed, print them as 0/1
+            v = np.unpackbits(v, axis=1, count=X_train.shape[1])
         print(k, v)
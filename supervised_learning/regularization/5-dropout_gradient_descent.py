@@ -13,13 +13,16 @@ def dropout_gradient_descent(Y, weights, cache, alpha, keep_prob, L):
         m: number of data points
     weights: dictionary of the weights and biases of the neural network
     cache: dictionary of the outputs and dropout masks of each layer of the nn
+        as returned by dropout_forward_prop, with bit-packed masks
     alpha: learning rate
     keep_prob: probability that a node will be kept
     L: number of layers of the network
     Weights of the network updated in place
+    The gradients are computed in the dtype of the cached outputs
     """
     m = Y.shape[1]
-    dZ = (cache["A{}".format(L)] - Y)
+    A_L = cache["A{}".format(L)]
+    dZ = np.subtract(A_L, Y, dtype=A_L.dtype)
     for layer in range(L, 0, -1):
         a = cache["A{}".format(layer - 1)]
         dW = np.matmul(dZ, cache["A{}".format(layer-1)].T) / m
@@ -27,10 +30,13 @@ def dropout_gradient_descent(Y, weights, cache, alpha, keep_prob, L):
 
         if layer > 1:
             dZ_tmp = (1 - np.square(a))
-            mask = cache["D{}".format(layer-1)]
-            dZ = np.matmul(
-                weights["W{}".format(layer)].T, dZ
-                ) * dZ_tmp * mask
+            mask = np.unpackbits(cache["D{}".format(layer-1)], axis=1,
+                                 count=m)
+            dZ = np.matmul(weights["W{}".format(layer)].T, dZ)
+            dZ *= dZ_tmp
+            # in place, so the integer mask does not promote float32 to
+            #   float64
+            dZ *= mask
             dZ /= keep_prob
 
         weights["W{}".format(layer)] -= (alpha * dW)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+L2-regularized gradient descent with lazy weight decay
+"""
+import numpy as np
+
+
+class L2Regularizer:
+    """
+    Trains a tanh / softmax network with L2 regularization, like
+        l2_reg_gradient_descent and l2_reg_cost, without a separate
+        weight decay pass or norm computation per step
+
+    Each weight matrix is kept as a scalar times the array in the weights
+        dictionary, W = scales[layer] * weights['W{layer}']: the decay
+        factor (1 - alpha * lambtha / m) of a step multiplies the scalar
+        only, and the gradient step is one in-place update of the array.
+        The squared norm of every array is updated incrementally from two
+        dot products, so the regularized cost costs O(L)
+    The scales are folded back into the arrays (materialize) whenever one
+        gets small, and the norms are recomputed exactly every refresh
+        steps so rounding errors cannot accumulate
+    """
+    def __init__(self, weights, L, lambtha, refresh=100):
+        """
+        weights: dictionary of the weights and biases of the network,
+            updated in place
+        L: number of layers of the network
+        lambtha: L2 regularization parameter
+        refresh: number of steps between exact norm computations
+        """
+        self.weights = weights
+        self.L = L
+        self.lambtha = lambtha
+        self.refresh = refresh
+        self.scales = {layer: 1.0 for layer in range(1, L + 1)}
+        self.__grads = {}
+        self.__steps = 0
+        self.__norms()
+
+    def __norms(self):
+        """Computes the exact squared norm of every weight array"""
+        self.__sq_norms = {}
+        for layer in range(1, self.L + 1):
+            W = self.weights['W' + str(layer)]
+            self.__sq_norms[layer] = float(np.vdot(W, W))
+
+    def materialize(self):
+        """
+        Folds the scales into the weight arrays, which then hold the
+            actual weights of the network
+        Returns the weights dictionary
+        """
+        for layer in range(1, self.L + 1):
+            if self.scales[layer] != 1.0:
+                self.weights['W' + str(layer)] *= self.scales[layer]
+                self.scales[layer] = 1.0
+        self.__norms()
+        return self.weights
+
+    def cost(self, cost, m):
+        """
+        cost: cost of the network without L2 regularization
+        m: number of data points used
+        Returns the cost of the network accounting for L2 regularization
+        """
+        sum_of_squared_weights = sum(
+            self.scales[layer] ** 2 * self.__sq_norms[layer]
+            for layer in range(1, self.L + 1))
+        return cost + self.lambtha / (2 * m) * sum_of_squared_weights
+
+    def forward_prop(self, X):
+        """
+        X: numpy.ndarray of shape (nx, m) containing the input data
+        Hidden layers use tanh, the last layer a softmax activation; the
+            scale of each layer multiplies the (nodes, m) product instead
+            of its weights
+        Returns a dictionary of the outputs A0 ... AL of each layer
+        """
+        cache = {'A0': X}
+        for layer in range(1, self.L + 1):
+            Z = np.matmul(self.weights['W' + str(layer)],
+                          cache['A' + str(layer - 1)])
+            if self.scales[layer] != 1.0:
+                Z *= self.scales[layer]
+            Z += self.weights['b' + str(layer)]
+            if layer == self.L:
+                Z -= np.max(Z, axis=0)
+                np.exp(Z, out=Z)
+                Z /= np.sum(Z, axis=0)
+            else:
+                np.tanh(Z, out=Z)
+            cache['A' + str(layer)] = Z
+        return cache
+
+    def gradient_descent(self, Y, cache, alpha):
+        """
+        Y: one-hot numpy.ndarray of shape (classes, m)
+            contains the correct labels for the data
+        cache: dictionary of the outputs of each layer of the network,
+            as returned by forward_prop
+        alpha: learning rate
+        Updates the weights and biases of the network in place
+        """
+        m = Y.shape[1]
+        decay = 1 - alpha * self.lambtha / m
+        if decay <= 0:
+            raise ValueError("alpha * lambtha / m must be less than 1")
+        dZ = cache['A' + str(self.L)] - Y
+        for layer in range(self.L, 0, -1):
+            W = self.weights['W' + str(layer)]
+            A = cache['A' + str(layer - 1)]
+            scale = self.scales[layer]
+            G = self.__grads.get(layer)
+            if G is None or G.shape != W.shape or G.dtype != W.dtype:
+                G = self.__grads[layer] = np.empty_like(W)
+            # gradient of the unregularized cost, times m
+            np.matmul(dZ, A.T, out=G)
+            db = np.sum(dZ, axis=1, keepdims=True) / m
+            if layer > 1:
+                dZ = np.matmul(W.T, dZ)
+                dZ *= scale * (1 - A ** 2)
+            # W' = decay * W - alpha * G / m, with W = scale * V:
+            #   scale' = decay * scale, V' = V - c * G
+            scale *= decay
+            c = alpha / (m * scale)
+            sq_norm = (self.__sq_norms[layer] - 2 * c * np.vdot(W, G) +
+                       c * c * np.vdot(G, G))
+            G *= c
+            W -= G
+            self.scales[layer] = scale
+            self.__sq_norms[layer] = max(float(sq_norm), 0.0)
+            self.weights['b' + str(layer)] -= alpha * db
+
+        self.__steps += 1
+        if min(self.scales.values()) < 2 ** -20:
+            self.materialize()
+        elif self.__steps % self.refresh == 0:
+            self.__norms()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""per-phase timing, allocation and throughput profiling of training"""
+import csv
+import io
+import json
+import time
+import tracemalloc
+from functools import wraps
+import numpy as np
+
+# the methods attach times on a model that does not declare its own
+# PHASES, each under its own name
+PHASES = ('forward_prop', 'cost', 'gradient_descent', 'gradients',
+          'evaluate')
+# the columns of stats, to_json and to_csv
+FIELDS = ('phase', 'calls', 'seconds', 'mean_ms', 'examples',
+          'examples_per_sec', 'peak_bytes', 'alloc_arrays')
+
+
+def examples(args):
+    """
+    Number of examples in a call: the last axis of its first array, or of
+        the first array of a dictionary argument such as a cache
+    """
+    for arg in args:
+        if isinstance(arg, dict):
+            arg = next((value for value in arg.values()
+                        if isinstance(value, np.ndarray)), None)
+        if isinstance(arg, np.ndarray):
+            return arg.shape[-1]
+    return 0
+
+
+def snapshot():
+    """A tracemalloc snapshot of the data buffers of numpy arrays"""
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)])
+
+
+def arrays(end, start):
+    """Number of array buffers allocated between two snapshots and in use"""
+    return sum(stat.count_diff for stat in end.compare_to(start, 'filename'))
+
+
+class Profiler:
+    """
+    Collects the wall time, allocations and throughput of each training
+        phase of a model
+
+    Nothing is instrumented until attach or wrap is called, so a model
+        that is not being profiled runs its original, unwrapped methods:
+        attach shadows the phase methods of one model instance with timed
+        wrappers (detach removes them), and wrap returns a timed version
+        of a plain function such as dropout_forward_prop
+
+    Phases nest (evaluate calls forward_prop and cost), and the time of
+        each phase includes that of the phases it calls; a phase called
+        from within itself (through another method timed as the same
+        phase) is recorded once, by its outermost call
+    """
+    def __init__(self, memory=False):
+        """
+        memory: whether to trace allocations with tracemalloc, summed over
+            the calls of each phase: peak_bytes is the peak memory the
+            phase allocated above what was in use when it started, and
+            alloc_arrays the number of numpy array buffers it allocated
+            and left in use (a snapshot diff, so temporaries freed within
+            the phase only show in peak_bytes). Tracing slows every
+            allocation and snapshots are taken around every call, so it
+            is off by default, and it only runs while the profiler is
+            entered as a context manager
+        """
+        self.__memory = memory
+        self.__records = {}
+        self.__attached = []
+        self.__peaks = []
+        self.__started = False
+
+    def __enter__(self):
+        if self.__memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started = True
+        return self
+
+    def __exit__(self, *exc):
+        self.detach()
+        if self.__started:
+            tracemalloc.stop()
+            self.__started = False
+
+    def wrap(self, function, phase=None):
+        """
+        Returns function timed as phase (by default its name)
+        """
+        phase = phase or function.__name__
+        record = self.__records.setdefault(
+            phase, {'calls': 0, 'seconds': 0.0, 'examples': 0,
+                    'peak_bytes': 0, 'alloc_arrays': 0, 'active': 0})
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if record['active']:
+                return function(*args, **kwargs)
+            record['active'] += 1
+            tracing = self.__memory and tracemalloc.is_tracing()
+            if tracing:
+                start_snapshot = snapshot()
+                start_bytes = tracemalloc.get_traced_memory()[0]
+                self.__peaks.append(start_bytes)
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record['seconds'] += time.perf_counter() - start
+                record['calls'] += 1
+                record['examples'] += examples(args)
+                record['active'] -= 1
+                if tracing:
+                    # a nested phase reset the peak, it saved it on the stack
+                    peak = max(tracemalloc.get_traced_memory()[1],
+                               self.__peaks.pop())
+                    record['peak_bytes'] += peak - start_bytes
+                    if self.__peaks:
+                        self.__peaks[-1] = max(self.__peaks[-1], peak)
+                    record['alloc_arrays'] += arrays(snapshot(),
+                                                     start_snapshot)
+        return timed
+
+    def attach(self, model, phases=None):
+        """
+        Times the methods of one model (those it has among phases) until
+            detach
+        phases is a dict mapping method names to the phase each is timed
+            as, or a sequence of method names timed under their own name;
+            by default the model's own PHASES attribute if it declares
+            one, else the module's PHASES
+        Returns the profiler
+        """
+        if phases is None:
+            phases = getattr(model, 'PHASES', PHASES)
+        if not isinstance(phases, dict):
+            phases = {name: name for name in phases}
+        for name, phase in phases.items():
+            method = getattr(model, name, None)
+            if callable(method) and (model, name) not in self.__attached:
+                setattr(model, name, self.wrap(method, phase))
+                self.__attached.append((model, name))
+        return self
+
+    def detach(self):
+        """Restores the original methods of every attached model"""
+        for model, name in reversed(self.__attached):
+            delattr(model, name)
+        self.__attached = []
+
+    def reset(self):
+        """Clears the collected data"""
+        for record in self.__records.values():
+            record.update(calls=0, seconds=0.0, examples=0, peak_bytes=0,
+                          alloc_arrays=0)
+
+    def stats(self):
+        """
+        Returns a list with one dict of FIELDS per phase that was called
+        """
+        stats = []
+        for phase, record in self.__records.items():
+            if not record['calls']:
+                continue
+            seconds = record['seconds']
+            stats.append({
+                'phase': phase,
+                'calls': record['calls'],
+                'seconds': seconds,
+                'mean_ms': seconds / record['calls'] * 1000,
+                'examples': record['examples'],
+                'examples_per_sec':
+                    record['examples'] / seconds if seconds else 0.0,
+                'peak_bytes':
+                    record['peak_bytes'] if self.__memory else None,
+                'alloc_arrays':
+                    record['alloc_arrays'] if self.__memory else None})
+        return stats
+
+    def to_json(self, filename=None):
+        """
+        Exports stats as JSON, into filename if given
+        Returns the JSON string
+        """
+        text = json.dumps(self.stats(), indent=2)
+        if filename is not None:
+            with open(filename, 'w') as file:
+                file.write(text)
+        return text
+
+    def to_csv(self, filename=None):
+        """
+        Exports stats as CSV with a header row, into filename if given
+        Returns the CSV string
+        """
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(self.stats())
+        text = buffer.getvalue()
+        if filename is not None:
+            with open(filename, 'w', newline='') as file:
+                file.write(text)
+        return text
@@ -9,7 +9,8 @@ create_train_op = __import__('5-create_train_op').create_train_op
 
 
 def train(X_train, Y_train, X_valid, Y_valid, layer_sizes,
-          activations, alpha, iterations, save_path="/tmp/model.ckpt"):
+          activations, alpha, iterations, save_path="/tmp/model.ckpt",
+          early_stopping=None):
     """
     function that builds, trains, and saves a neural network classifier
     X_train: numpy.ndarray containing the training input data
@@ -19,6 +20,11 @@ def train(X_train, Y_train, X_valid, Y_valid, layer_sizes,
     layer_sizes: list containing number of nodes in each layer of the network
     activations: list containing activation functions for each layer of network
     iterations: number of iterations to train over
+    early_stopping: optional early_stopping.EarlyStopping controller, given
+        the validation cost every time it is due; training stops when it
+        says so and the model is saved with the best weights it kept
+    The costs and accuracies are only computed on the iterations they are
+        printed or needed for early stopping
     Returns save_path, which designates where to save the model
     """
     # define the computation graph (i.e. neural network structure)
@@ -50,22 +56,44 @@ def train(X_train, Y_train, X_valid, Y_valid, layer_sizes,
     # start session to execute computation graph
     with tf.Session() as sess:
         sess.run(init)
+        variables = tf.trainable_variables()
+
+        def get_weights():
+            """current values of the trainable variables"""
+            return sess.run(variables)
+
+        def set_weights(values):
+            """assigns values to the trainable variables"""
+            for variable, value in zip(variables, values):
+                variable.load(value, sess)
+
         for i in range(iterations + 1):
-            t_cost, t_accuracy = sess.run([loss, accuracy],
-                                          feed_dict={x: X_train, y: Y_train})
-            v_cost, v_accuracy = sess.run([loss, accuracy],
-                                          feed_dict={x: X_valid, y: Y_valid})
+            report = i % 100 == 0 or i == iterations
+            due = early_stopping is not None and early_stopping.due(i)
+            if report or due:
+                v_cost, v_accuracy = sess.run(
+                    [loss, accuracy], feed_dict={x: X_valid, y: Y_valid})
+            stop = due and early_stopping.update(v_cost, get_weights)
 
-            if i % 100 == 0 or i == iterations:
+            # the iteration training stops at is always reported
+            if report or stop:
+                t_cost, t_accuracy = sess.run(
+                    [loss, accuracy], feed_dict={x: X_train, y: Y_train})
                 print("After {} iterations:".format(i))
                 print("\tTraining Cost: {}".format(t_cost))
                 print("\tTraining Accuracy: {}".format(t_accuracy))
                 print("\tValidation Cost: {}".format(v_cost))
                 print("\tValidation Accuracy: {}".format(v_accuracy))
 
+            if stop:
+                break
+
             if i < iterations:
                 sess.run(train_op, feed_dict={x: X_train, y: Y_train})
 
+        if early_stopping is not None:
+            early_stopping.restore(set_weights)
+
         # save model
         saver = tf.train.Saver()
         save_path = saver.save(sess, save_path)
@@ -33,7 +33,101 @@ def initialize(X, k):
     return centroids
 
 
-def kmeans(X, k, iterations=1000):
+def initialize_plusplus(X, k, chunk_size=4096):
+    """
+    k-means++ seeding: the first centroid is a data point drawn uniformly,
+        each next one a data point drawn with probability proportional to
+        its squared distance to the nearest centroid chosen so far
+    X is a numpy.ndarray of shape (n, d) containing the dataset
+    k is a positive integer containing the number of clusters
+    Returns: a numpy.ndarray of shape (k, d) containing the initialized
+        centroids, or None on failure
+    """
+    if not isinstance(X, np.ndarray) or not isinstance(k, int):
+        return None
+    if len(X.shape) != 2 or k < 1:
+        return None
+
+    n, d = X.shape
+    centroids = np.empty((k, d))
+    centroids[0] = X[np.random.randint(n)]
+    _, nearest = assign(X, centroids[:1], chunk_size)
+    for i in range(1, k):
+        total = np.sum(nearest)
+        if total > 0:
+            index = np.searchsorted(np.cumsum(nearest),
+                                    np.random.uniform(0, total))
+            index = min(index, n - 1)
+        else:
+            # every point is already a centroid
+            index = np.random.randint(n)
+        centroids[i] = X[index]
+        # only the distances to the new centroid can lower the minimum
+        _, distances = assign(X, centroids[i:i + 1], chunk_size)
+        np.minimum(nearest, distances, out=nearest)
+    return centroids
+
+
+def squared_distances(X, C):
+    """
+    Squared distances between the points of X and the centroids in C
+    They are expanded as ||x||^2 - 2 x.c + ||c||^2, one matrix product
+        instead of a (n, k, d) tensor; X and C are shifted by the mean of
+        C first, which changes no distance but keeps the expansion from
+        cancelling 4 data far from the origin
+    Returns: a numpy.ndarray of shape (n, k)
+    """
+    center = np.mean(C, axis=0)
+    X = X - center
+    C = C - center
+    distances = np.matmul(X, C.T)
+    distances *= -2
+    distances += np.einsum('ij,ij->i', C, C)
+    distances += np.einsum('ij,ij->i', X, X)[:, np.newaxis]
+    return np.maximum(distances, 0, out=distances)
+
+
+def assign(X, C, chunk_size=4096):
+    """
+    Assigns each data point of X to its nearest centroid in C
+    The distances are computed chunk_size points at a time, so memory
+        stays at a (chunk_size, k) array whatever the size of X
+    Returns: clss, the index of the nearest centroid of each point, and
+        the squared distance of each point to it
+    """
+    n = X.shape[0]
+    clss = np.empty(n, dtype=np.intp)
+    nearest = np.empty(n)
+    for start in range(0, n, chunk_size):
+        distances = squared_distances(X[start:start + chunk_size], C)
+        rows = np.arange(distances.shape[0])
+        stop = start + distances.shape[0]
+        clss[start:stop] = np.argmin(distances, axis=1)
+        nearest[start:stop] = distances[rows, clss[start:stop]]
+    return clss, nearest
+
+
+def centroids(X, clss, k):
+    """
+    Computes the centroid of each cluster, without a loop over k
+    If a cluster contains no data points, its centroid is reinitialized
+        (in the order of the clusters)
+    Returns: the centroids, of shape (k, d), and a boolean numpy.ndarray
+        of shape (k,) that is True 4 the clusters that were empty
+    """
+    d = X.shape[1]
+    counts = np.bincount(clss, minlength=k)
+    newCentroids = np.empty((k, d))
+    for j in range(d):
+        newCentroids[:, j] = np.bincount(clss, weights=X[:, j], minlength=k)
+    empty = counts == 0
+    newCentroids[~empty] /= counts[~empty, np.newaxis]
+    for i in np.flatnonzero(empty):
+        newCentroids[i] = initialize(X, 1)
+    return newCentroids, empty
+
+
+def kmeans(X, k, iterations=1000, init='uniform', chunk_size=4096):
     """
     X is a numpy.ndarray of shape (n, d) containing the dataset
         n is the number of data points
@@ -41,10 +135,13 @@ def kmeans(X, k, iterations=1000):
     k is a positive integer containing the number of clusters
     iterations is a positive integer containing the maximum number of
         iterations that should be performed
-    If no change in the cluster centroids occurs between iterations,
+    init is 'uniform' to initialize the cluster centroids using a
+        multivariate uniform distribution (based on 0-initialize.py), or
+        'k-means++' to use initialize_plusplus
+    chunk_size is the number of data points whose distances to the
+        centroids are computed at a time (see assign)
+    If no change in the cluster assignments occurs between iterations,
         function should return
-    Initialize the cluster centroids using a multivariate uniform distribution
-        (based on 0-initialize.py)
     If a cluster contains no data points during the update step, reinitialize
         its centroid
     Returns: C, clss, or None, None on failure
@@ -64,38 +161,28 @@ def kmeans(X, k, iterations=1000):
     if len(X.shape) != 2 or k < 1 or iterations < 1:
         return None, None
 
-    clusterCentroids = initialize(X, k)
+    if init == 'uniform':
+        clusterCentroids = initialize(X, k)
+    elif init == 'k-means++':
+        clusterCentroids = initialize_plusplus(X, k, chunk_size)
+    else:
+        return None, None
     if clusterCentroids is None:
         return None, None
 
-    n, d = X.shape
-
+    clss, _ = assign(X, clusterCentroids, chunk_size)
     # iterate through the maximum number of iterations
     for _ in range(iterations):
-        # calculate distances and assign classes using broadcasting
-        clss = np.argmin(
-            np.linalg.norm(X[:, np.newaxis] - clusterCentroids, axis=2), axis=1
-        )
-
-        # calculate new centroids 4 non-empty clusters
-        newCentroids = np.zeros((k, d))
-        for i in range(k):
-            clusterPoints = X[clss == i]
-            if clusterPoints.size == 0:
-                newCentroids[i] = initialize(X, 1)
-            else:
-                newCentroids[i] = np.mean(clusterPoints, axis=0)
+        # calculate new centroids, reinitializing those of empty clusters
+        newCentroids, empty = centroids(X, clss, k)
 
         # recalculate cluster assignments
-        clss = np.argmin(
-            np.linalg.norm(X[:, np.newaxis] - newCentroids, axis=2), axis=1
-        )
+        newClss, _ = assign(X, newCentroids, chunk_size)
+        clusterCentroids = newCentroids
 
-        # check 4 convergence
-        if np.array_equal(newCentroids, clusterCentroids):
+        # check 4 convergence: the centroids would not move again
+        if not empty.any() and np.array_equal(newClss, clss):
             break
-
-        # update centroids
-        clusterCentroids = newCentroids
+        clss = newClss
 
     return clusterCentroids, clss
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+kmeans = __import__('1-kmeans').kmeans
+hamerly_kmeans = __import__('hamerly_kmeans').kmeans
+
+
+def blobs(n, d, k, spread):
+    """n points around k random centers, of standard deviation spread"""
+    centers = np.random.uniform(-10, 10, (k, d))
+    X = centers[np.random.randint(0, k, n)]
+    return X + np.random.normal(0, spread, (n, d))
+
+
+if __name__ == "__main__":
+    n, d, k = 100000, 16, 32
+    for name, spread in [('well separated', 0.5), ('overlapping', 8)]:
+        np.random.seed(0)
+        X = blobs(n, d, k, spread)
+
+        np.random.seed(1)
+        start = time.perf_counter()
+        C, clss = kmeans(X, k, iterations=100, init='k-means++')
+        lloyd = time.perf_counter() - start
+
+        np.random.seed(1)
+        stats = {}
+        start = time.perf_counter()
+        C_fast, clss_fast = hamerly_kmeans(X, k, iterations=100,
+                                           init='k-means++', stats=stats)
+        hamerly = time.perf_counter() - start
+
+        print("{}: X {}, k {}, {} iterations".format(
+            name, X.shape, k, stats['iterations']))
+        print("\tdistances: {} of {}, {:.1%} saved".format(
+            stats['distances'], stats['lloyd'],
+            1 - stats['distances'] / stats['lloyd']))
+        print("\tkmeans {:.2f}s, hamerly {:.2f}s, speedup {:.2f}x".format(
+            lloyd, hamerly, lloyd / hamerly))
+        print("\tsame C, clss: {}".format(
+            np.allclose(C, C_fast) and np.array_equal(clss, clss_fast)))
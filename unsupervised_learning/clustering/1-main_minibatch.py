@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import time
+import numpy as np
+kmeans_module = __import__('1-kmeans')
+MiniBatchKMeans = __import__('minibatch_kmeans').MiniBatchKMeans
+
+
+def variance(X, C, chunk_size=65536):
+    """total intra-cluster variance of X, computed chunk by chunk"""
+    total = 0.0
+    for start in range(0, X.shape[0], chunk_size):
+        chunk = np.asarray(X[start:start + chunk_size])
+        total += np.sum(kmeans_module.assign(chunk, C)[1])
+    return total
+
+
+def read_chunks(filename, d, rows):
+    """
+    generator of the (rows, d) float64 chunks of a raw binary file, read
+    one at a time, like data arriving from a file or a socket
+    """
+    with open(filename, 'rb') as file:
+        while True:
+            chunk = np.fromfile(file, dtype=np.float64, count=rows * d)
+            if not chunk.size:
+                return
+            yield chunk.reshape(-1, d)
+
+
+if __name__ == "__main__":
+    n, d, k = 500000, 8, 16
+    np.random.seed(0)
+    centers = np.random.uniform(-50, 50, (k, d))
+    X = centers[np.random.randint(0, k, n)]
+    X += np.random.normal(0, 3, X.shape)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # the data set is only read back through a memmap or in chunks
+        npy = os.path.join(directory, 'X.npy')
+        raw = os.path.join(directory, 'X.bin')
+        np.save(npy, X)
+        X.tofile(raw)
+        del X
+        X = np.load(npy, mmap_mode='r')
+        print("X {} memory-mapped from {}".format(X.shape, npy))
+
+        np.random.seed(1)
+        start = time.perf_counter()
+        C, _ = kmeans_module.kmeans(np.asarray(X), k, init='k-means++')
+        print("\tkmeans (X in memory): {:.2f}s, variance {:.4g}".format(
+            time.perf_counter() - start, variance(X, C)))
+
+        np.random.seed(1)
+        start = time.perf_counter()
+        memmapped = MiniBatchKMeans(k, batch_size=4096).fit(X, epochs=2)
+        print("\tfit on the memmap, 2 epochs: {:.2f}s, variance {:.4g}".format(
+            time.perf_counter() - start, variance(X, memmapped.C)))
+
+        np.random.seed(1)
+        start = time.perf_counter()
+        streamed = MiniBatchKMeans(k, batch_size=4096)
+        streamed.fit(read_chunks(raw, d, rows=50000))
+        print("\tfit on a generator, 1 pass: {:.2f}s, variance {:.4g}".format(
+            time.perf_counter() - start, variance(X, streamed.C)))
+
+        np.random.seed(1)
+        online = MiniBatchKMeans(k, batch_size=4096)
+        for chunk in read_chunks(raw, d, rows=4096):
+            online.partial_fit(chunk)
+        print("\tpartial_fit per arriving chunk: variance {:.4g}".format(
+            variance(X, online.C)))
+        clss = online.predict(X)
+        print("\tcluster sizes:", np.bincount(clss, minlength=k))
+        del X
+
+    try:
+        MiniBatchKMeans(k, init='random')
+    except ValueError as error:
+        print("init='random':", error)
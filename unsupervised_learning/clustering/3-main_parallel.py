@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import numpy as np
+optimum_k = __import__('3-optimum').optimum_k
+
+if __name__ == "__main__":
+    np.random.seed(0)
+    centers = np.random.uniform(0, 100, (8, 2))
+    X = centers[np.random.randint(0, 8, 20000)]
+    X += np.random.normal(0, 4, X.shape)
+
+    print("X {}, k from 2 to 30, {} CPUs".format(X.shape, os.cpu_count()))
+    for workers in [None] + sorted({1, os.cpu_count()}):
+        np.random.seed(0)
+        start = time.perf_counter()
+        results, d_vars = optimum_k(X, kmin=2, kmax=30, workers=workers)
+        print("\t{}, 1 run per k: {:.2f}s".format(
+            'sequential' if workers is None else
+            '{} worker{}'.format(workers, 's' if workers > 1 else ''),
+            time.perf_counter() - start))
+    # several K-means runs per k, the best of which is kept
+    start = time.perf_counter()
+    results, d_vars = optimum_k(X, kmin=2, kmax=30,
+                                workers=os.cpu_count(), restarts=3)
+    print("\t{} worker(s), 3 runs per k: {:.2f}s".format(
+        os.cpu_count(), time.perf_counter() - start))
+    print(np.round(d_vars[:10]))
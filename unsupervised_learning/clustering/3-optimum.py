@@ -6,9 +6,11 @@ import numpy as np
 
 kmeans = __import__('1-kmeans').kmeans
 variance = __import__('2-variance').variance
+parallel_sweep = __import__('parallel_sweep')
 
 
-def optimum_k(X, kmin=1, kmax=None, iterations=1000):
+def optimum_k(X, kmin=1, kmax=None, iterations=1000, workers=None,
+              restarts=1, seed=0):
     """
     tests 4 the optimum number of clusters by variance
     X is a numpy.ndarray of shape (n, d) containing the data set
@@ -18,6 +20,15 @@ def optimum_k(X, kmin=1, kmax=None, iterations=1000):
         check 4 (inclusive)
     iterations is a positive integer containing the maximum number of
         iterations 4 K-means
+    workers is the number of processes the K-means of every k are run
+        on in parallel (see parallel_sweep), or None to run them one
+        after the other in this process; each parallel run is seeded
+        from its k, so the results do not depend on the number of
+        workers but differ from those of the sequential sweep
+    restarts and seed are those of the parallel sweep: the number of
+        K-means runs 4 each k, of which the one with the lowest variance
+        is kept, and the seed every run is derived from; the sequential
+        sweep makes one run per k from numpy's global random state
     This function should analyze at least 2 different cluster sizes
     Returns: results, d_vars, or None, None on failure
         results is a list containing the outputs of K-means 4 each cluster
@@ -34,12 +45,19 @@ def optimum_k(X, kmin=1, kmax=None, iterations=1000):
         or iterations < 1
         or (kmax is not None and (not isinstance(kmax, int) or kmax <= 0))
         or (kmax is not None and kmax <= kmin)
+        or (workers is not None and (not isinstance(workers, int)
+                                     or workers < 1))
     ):
         return None, None
 
     if kmax is None:
         kmax = X.shape[0]
 
+    if workers is not None:
+        return parallel_sweep.optimum_k(X, kmin, kmax, iterations,
+                                        restarts=restarts, workers=workers,
+                                        seed=seed)
+
     clusterResults = []
     varianceDiffs = []
     baseVariance = 0  # reference variance 4 k = kmin
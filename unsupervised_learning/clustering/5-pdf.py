@@ -5,6 +5,29 @@ calculates the probability density function of a Gaussian distribution
 import numpy as np
 
 
+def log_pdf(X, m, S):
+    """
+    Logarithm of the density of X under the Gaussian distribution of mean
+        m and covariance S, without inverting S or computing its
+        determinant: with the Cholesky factor S = L L^T,
+        log P = -(d log(2 pi) + 2 sum(log diag L) + ||L^-1 (x - m)||^2) / 2
+        where the small d x d factor is inverted once and applied to all
+        the points with a single matrix product
+    Stays finite where P itself underflows (high dimensions, far points)
+    Returns: a numpy.ndarray of shape (n,) of log densities, or None if S
+        is not positive definite
+    """
+    try:
+        L = np.linalg.cholesky(S)
+    except np.linalg.LinAlgError:
+        return None
+    d = X.shape[1]
+    whitened = np.matmul(X - m, np.linalg.inv(L).T)
+    mahalanobis = np.einsum('ij,ij->i', whitened, whitened)
+    log_det = 2 * np.sum(np.log(np.diagonal(L)))
+    return -0.5 * (d * np.log(2 * np.pi) + log_det + mahalanobis)
+
+
 def pdf(X, m, S):
     """
     X is a numpy.ndarray of shape (n, d) containing the data points whose PDF
@@ -14,7 +37,7 @@ def pdf(X, m, S):
         distribution
     Returns: P, or None on failure
         P is a numpy.ndarray of shape (n,) containing the PDF values for each
-            data point
+            data point, with a minimum value of 1e-300
     """
     if (
         not isinstance(X, np.ndarray)
@@ -24,3 +47,11 @@ def pdf(X, m, S):
         return None
     if len(X.shape) != 2 or len(m.shape) != 1 or len(S.shape) != 2:
         return None
+    d = X.shape[1]
+    if m.shape[0] != d or S.shape != (d, d):
+        return None
+
+    P = log_pdf(X, m, S)
+    if P is None:
+        return None
+    return np.maximum(np.exp(P), 1e-300)
@@ -3,7 +3,7 @@
 calculates the expectation step in the EM algorithm for a GMM
 """
 import numpy as np
-pdf = __import__('5-pdf').pdf
+log_pdf = __import__('5-pdf').log_pdf
 
 
 def expectation(X, pi, m, S):
@@ -15,6 +15,11 @@ def expectation(X, pi, m, S):
     S is a numpy.ndarray of shape (k, d, d) containing the covariance matrices
         for each cluster
     You may use at most 1 loop
+    The E-step runs in log space: each S[i] is factored once (Cholesky) and
+        the log density of every point under cluster i comes from one
+        matrix product with the factor's inverse (see log_pdf), and the
+        posteriors and log likelihood are normalized with logsumexp, so
+        nothing underflows even 4 high-dimensional data
     Returns: g, l, or None, None on failure
         g is a numpy.ndarray of shape (k, n) containing the posterior
             probabilities for each data point in each cluster
@@ -33,5 +38,22 @@ def expectation(X, pi, m, S):
         or m.shape[1] != S.shape[1]
         or S.shape[1] != S.shape[2]
         or m.shape[0] != S.shape[0]
+        or X.shape[1] != m.shape[1]
+        or pi.shape[0] != m.shape[0]
     ):
         return None, None
+
+    k = pi.shape[0]
+    # log of the prior times the density of each point in each cluster
+    log_joint = np.empty((k, X.shape[0]))
+    for i in range(k):
+        log_density = log_pdf(X, m[i], S[i])
+        if log_density is None:
+            return None, None
+        log_joint[i] = np.log(pi[i]) + log_density
+
+    # logsumexp over the clusters
+    peak = np.max(log_joint, axis=0)
+    log_marginal = peak + np.log(np.sum(np.exp(log_joint - peak), axis=0))
+    g = np.exp(log_joint - log_marginal)
+    return g, np.sum(log_marginal)
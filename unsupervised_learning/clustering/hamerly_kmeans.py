@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+K-means accelerated with the triangle inequality (Hamerly's algorithm)
+"""
+import numpy as np
+
+kmeans_module = __import__('1-kmeans')
+initialize = kmeans_module.initialize
+initialize_plusplus = kmeans_module.initialize_plusplus
+squared_distances = kmeans_module.squared_distances
+centroids = kmeans_module.centroids
+
+
+def nearest_two(X, C, chunk_size=4096):
+    """
+    Distances of each point of X to its nearest and second nearest
+        centroid in C, chunk_size points at a time
+    Returns: clss, the index of the nearest centroid, and the two
+        distances, each of shape (n,)
+    """
+    n, k = X.shape[0], C.shape[0]
+    clss = np.empty(n, dtype=np.intp)
+    upper = np.empty(n)
+    lower = np.full(n, np.inf)
+    for start in range(0, n, chunk_size):
+        distances = squared_distances(X[start:start + chunk_size], C)
+        stop = start + distances.shape[0]
+        index = np.argmin(distances, axis=1)
+        rows = np.arange(distances.shape[0])
+        clss[start:stop] = index
+        upper[start:stop] = np.sqrt(distances[rows, index])
+        if k > 1:
+            distances[rows, index] = np.inf
+            lower[start:stop] = np.sqrt(np.min(distances, axis=1))
+    return clss, upper, lower
+
+
+def kmeans(X, k, iterations=1000, init='uniform', chunk_size=4096,
+           stats=None):
+    """
+    performs K-means on a dataset, like kmeans in 1-kmeans.py, skipping
+        the distance computations the triangle inequality proves useless
+
+    Every point keeps an upper bound u on the distance to its centroid
+        and a lower bound l on the distance to every other centroid. When
+        the centroids move, u grows by the shift of the point's centroid
+        and l shrinks by the largest shift of the others. A point cannot
+        change cluster while u <= max(l, s), s being half the distance
+        from its centroid to the nearest other one; only the points that
+        fail this test get u recomputed exactly (one distance), and only
+        those that still fail get their distances to all k centroids
+    The centroid updates, reinitialization of empty clusters and
+        convergence test are those of kmeans, so with the same random
+        state the same C, clss are returned (up to exact ties)
+
+    X is a numpy.ndarray of shape (n, d) containing the dataset
+    k is a positive integer containing the number of clusters
+    iterations is a positive integer containing the maximum number of
+        iterations that should be performed
+    init is 'uniform' or 'k-means++', as in kmeans
+    chunk_size is the number of data points whose distances to the
+        centroids are computed at a time
+    stats is an optional dictionary filled with the number of
+        point-centroid distances computed ('distances'), the number a
+        plain Lloyd iteration would have computed ('lloyd') and the
+        number of iterations ('iterations')
+    Returns: C, clss, or None, None on failure
+    """
+    if (
+        not isinstance(X, np.ndarray)
+        or not isinstance(k, int)
+        or not isinstance(iterations, int)
+    ):
+        return None, None
+
+    if len(X.shape) != 2 or k < 1 or iterations < 1:
+        return None, None
+
+    if init == 'uniform':
+        C = initialize(X, k)
+    elif init == 'k-means++':
+        C = initialize_plusplus(X, k, chunk_size)
+    else:
+        return None, None
+    if C is None:
+        return None, None
+
+    n = X.shape[0]
+    clss, upper, lower = nearest_two(X, C, chunk_size)
+    computed = n * k
+    done = 0
+    for _ in range(iterations):
+        done += 1
+        newC, empty = centroids(X, clss, k)
+        shifts = np.sqrt(np.sum((newC - C) ** 2, axis=1))
+        C = newC
+
+        # move the bounds by the shifts of the centroids
+        upper += shifts[clss]
+        if k > 1:
+            largest = np.argmax(shifts)
+            second = np.max(np.delete(shifts, largest))
+            lower -= np.where(clss == largest, second, shifts[largest])
+            between = np.sqrt(squared_distances(C, C))
+            np.fill_diagonal(between, np.inf)
+            half = np.min(between, axis=1) / 2
+            bound = np.maximum(half[clss], lower)
+        else:
+            bound = lower
+
+        newClss = clss.copy()
+        candidates = np.flatnonzero(upper > bound)
+        if candidates.size:
+            # tighten the upper bounds to the exact distances
+            upper[candidates] = np.sqrt(np.sum(
+                (X[candidates] - C[clss[candidates]]) ** 2, axis=1))
+            computed += candidates.size
+            candidates = candidates[upper[candidates] > bound[candidates]]
+        if candidates.size:
+            newClss[candidates], upper[candidates], lower[candidates] = \
+                nearest_two(X[candidates], C, chunk_size)
+            computed += candidates.size * k
+
+        # check 4 convergence: the centroids would not move again
+        if not empty.any() and np.array_equal(newClss, clss):
+            clss = newClss
+            break
+        clss = newClss
+
+    if stats is not None:
+        stats.update(distances=computed, lloyd=n * k * (done + 1),
+                     iterations=done)
+    return C, clss
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+mini-batch K-means 4 datasets streamed in chunks
+"""
+import numpy as np
+
+kmeans_module = __import__('1-kmeans')
+assign = kmeans_module.assign
+initialize_plusplus = kmeans_module.initialize_plusplus
+
+
+class MiniBatchKMeans:
+    """
+    K-means fitted one mini-batch at a time, so X never has to be in
+        memory: it can be an np.memmap, an iterator of chunks, or data
+        that keeps arriving (partial_fit)
+
+    Each mini-batch is assigned to the nearest centroids (with assign),
+        then every centroid moves towards the mean of its points with its
+        own learning rate 1 / (number of points it has been given so far),
+        the update of Sculley's web-scale k-means: a centroid is always
+        the mean of every point it was assigned, and settles as it sees
+        more of them
+    """
+    def __init__(self, k, batch_size=1024, init='k-means++',
+                 chunk_size=4096):
+        """
+        k is a positive integer containing the number of clusters
+        batch_size is the number of data points in a mini-batch
+        init is 'k-means++' or 'uniform', how the centroids are
+            initialized from the first mini-batch
+        chunk_size is the number of data points whose distances to the
+            centroids are computed at a time
+        """
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("k must be a positive integer")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if init not in ('k-means++', 'uniform'):
+            raise ValueError("init must be 'k-means++' or 'uniform'")
+        self.k = k
+        self.batch_size = batch_size
+        self.init = init
+        self.chunk_size = chunk_size
+        self.C = None
+        self.counts = np.zeros(k, dtype=np.int64)
+
+    def partial_fit(self, X):
+        """
+        Updates the centroids with one mini-batch
+        X is a numpy.ndarray of shape (m, d) containing the mini-batch; the
+            first one initializes the centroids and needs at least k points
+        Returns: the estimator
+        """
+        X = np.asarray(X, dtype=float)
+        if self.C is None:
+            if X.shape[0] < self.k:
+                raise ValueError("the first mini-batch needs at least k "
+                                 "data points")
+            if self.init == 'k-means++':
+                self.C = initialize_plusplus(X, self.k, self.chunk_size)
+            else:
+                self.C = kmeans_module.initialize(X, self.k)
+        clss, _ = assign(X, self.C, self.chunk_size)
+        counts = np.bincount(clss, minlength=self.k)
+        sums = np.empty_like(self.C)
+        for j in range(X.shape[1]):
+            sums[:, j] = np.bincount(clss, weights=X[:, j],
+                                     minlength=self.k)
+        seen = counts > 0
+        self.counts += counts
+        # c += (sum - count * c) / total, the mean of every point given
+        sums[seen] -= counts[seen, np.newaxis] * self.C[seen]
+        self.C[seen] += sums[seen] / self.counts[seen, np.newaxis]
+        return self
+
+    def batches(self, data):
+        """
+        Yields the mini-batches of data: an array (or np.memmap) is split
+            into contiguous mini-batches taken in a random order, each
+            chunk of an iterator into mini-batches
+        """
+        if isinstance(data, np.ndarray):
+            starts = np.arange(0, data.shape[0], self.batch_size)
+            for start in np.random.permutation(starts):
+                yield data[start:start + self.batch_size]
+            return
+        for chunk in data:
+            for start in range(0, len(chunk), self.batch_size):
+                yield chunk[start:start + self.batch_size]
+
+    def fit(self, data, epochs=1):
+        """
+        Fits the centroids to data
+        data is a numpy.ndarray (or np.memmap) of shape (n, d), or an
+            iterable of chunks of shape (m, d), such as a generator
+            reading a file; an iterable is consumed once whatever epochs
+        epochs is the number of passes over an array
+        Returns: the estimator
+        """
+        passes = epochs if isinstance(data, np.ndarray) else 1
+        for _ in range(passes):
+            for batch in self.batches(data):
+                self.partial_fit(batch)
+        return self
+
+    def predict(self, X):
+        """
+        X is a numpy.ndarray (or np.memmap) of shape (n, d)
+        Returns: clss, a numpy.ndarray of shape (n,) containing the index
+            of the cluster in C that each data point belongs to
+        """
+        if self.C is None:
+            raise ValueError("the estimator is not fitted")
+        clss = np.empty(X.shape[0], dtype=np.intp)
+        for start in range(0, X.shape[0], self.chunk_size):
+            chunk = np.asarray(X[start:start + self.chunk_size], dtype=float)
+            clss[start:start + len(chunk)], _ = assign(chunk, self.C,
+                                                       self.chunk_size)
+        return clss
+
+
+def minibatch_kmeans(X, k, batch_size=1024, epochs=1):
+    """
+    performs mini-batch K-means on a dataset, like kmeans
+    X is a numpy.ndarray (or np.memmap) of shape (n, d) containing the
+        dataset
+    k is a positive integer containing the number of clusters
+    batch_size is the number of data points in a mini-batch
+    epochs is the number of passes over X
+    Returns: C, clss, or None, None on failure
+    """
+    if not isinstance(X, np.ndarray) or len(X.shape) != 2:
+        return None, None
+    if not isinstance(k, int) or k < 1 or X.shape[0] < k:
+        return None, None
+    estimator = MiniBatchKMeans(k, batch_size).fit(X, epochs)
+    return estimator.C, estimator.predict(X)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+optimum_k sweep over a pool of worker processes
+"""
+import mmap
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+kmeans_module = __import__('1-kmeans')
+
+# per-process state of a pool worker, filled in by _attach
+_worker = {}
+
+
+def _source(X):
+    """
+    Describes where the workers can read X from without it being sent to
+        them: the file of an np.memmap opened directly on it, or else a
+        block of shared memory X is copied into once
+    Returns: the description and the SharedMemory to free (or None)
+    """
+    if isinstance(X, np.memmap) and isinstance(X.base, mmap.mmap) and \
+            X.filename is not None:
+        return ('file', X.filename, X.offset, X.shape, X.dtype.str,
+                X.flags.f_contiguous), None
+    memory = SharedMemory(create=True, size=max(X.nbytes, 1))
+    shared = np.ndarray(X.shape, dtype=X.dtype, buffer=memory.buf)
+    shared[...] = X
+    return ('shared', memory.name, X.shape, X.dtype.str), memory
+
+
+def _attach(source):
+    """Pool initializer: maps the read-only X described by source"""
+    if source[0] == 'file':
+        _, filename, offset, shape, dtype, fortran = source
+        X = np.memmap(filename, dtype=dtype, mode='r', offset=offset,
+                      shape=shape, order='F' if fortran else 'C')
+        _worker.update(X=X, memory=None)
+    else:
+        _, name, shape, dtype = source
+        memory = SharedMemory(name=name)
+        X = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        X.flags.writeable = False
+        _worker.update(X=X, memory=memory)
+
+
+def _seed(seed, k, restart):
+    """
+    Seeds numpy's global random state from (seed, k, restart) alone, so a
+        run does not depend on which worker it lands on
+    """
+    np.random.seed(np.random.SeedSequence([seed, k, restart])
+                   .generate_state(4))
+
+
+def _kmeans(job):
+    """
+    Pool worker: one K-means restart
+    Returns: k, C, clss and the total intra-cluster variance
+    """
+    k, restart, seed, iterations = job
+    X = _worker['X']
+    _seed(seed, k, restart)
+    C, clss = kmeans_module.kmeans(X, k, iterations)
+    if C is None:
+        return k, None, None, np.inf
+    _, nearest = kmeans_module.assign(X, C)
+    return k, C, clss, float(np.sum(nearest))
+
+
+def _sweep(X, worker, jobs, workers):
+    """
+    Runs worker on every job on a pool sharing X
+    The jobs of the largest k, the slowest, are started first, so the
+        sweep takes about the time of its slowest job when there are
+        enough workers
+    Returns: the list of results, in no particular order
+    """
+    jobs = sorted(jobs, key=lambda job: -job[0])
+    source, memory = _source(X)
+    try:
+        with Pool(workers, initializer=_attach, initargs=(source,)) as pool:
+            return list(pool.imap_unordered(worker, jobs, chunksize=1))
+    finally:
+        if memory is not None:
+            memory.close()
+            memory.unlink()
+
+
+def optimum_k(X, kmin=1, kmax=None, iterations=1000, restarts=1,
+              workers=1, seed=0):
+    """
+    tests 4 the optimum number of clusters by variance, like optimum_k in
+        3-optimum.py, running every k and restart in parallel
+    X is a numpy.ndarray (or np.memmap) of shape (n, d) containing the
+        data set
+    kmin, kmax and iterations are those of optimum_k
+    restarts is the number of K-means runs 4 each k, of which the one
+        with the lowest variance is kept
+    workers is the number of worker processes, a positive integer
+        (pass os.cpu_count() 4 one per CPU)
+    seed is the seed the random state of every run is derived from,
+        with its k and restart
+    Returns: results, d_vars, or None, None on failure
+        results is a list containing the outputs of the best K-means 4
+            each cluster size
+        d_vars is a list containing the difference in variance from the
+            smallest cluster size 4 each cluster size
+    """
+    if (
+        not isinstance(X, np.ndarray)
+        or len(X.shape) != 2
+        or not isinstance(kmin, int)
+        or kmin < 1
+        or not isinstance(iterations, int)
+        or iterations < 1
+        or (kmax is not None and (not isinstance(kmax, int) or kmax <= 0))
+        or (kmax is not None and kmax <= kmin)
+        or not isinstance(restarts, int)
+        or restarts < 1
+        or not isinstance(workers, int)
+        or workers < 1
+    ):
+        return None, None
+
+    if kmax is None:
+        kmax = X.shape[0]
+
+    jobs = [(k, restart, seed, iterations)
+            for k in range(kmin, kmax + 1) for restart in range(restarts)]
+    best = {}
+    for k, C, clss, var in _sweep(X, _kmeans, jobs, workers):
+        if C is None:
+            return None, None
+        if k not in best or var < best[k][2]:
+            best[k] = (C, clss, var)
+
+    ks = range(kmin, kmax + 1)
+    results = [best[k][:2] for k in ks]
+    d_vars = [best[kmin][2] - best[k][2] for k in ks]
+    return results, d_vars